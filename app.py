@@ -1,14 +1,13 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+import io
 import os
+import re
 from datetime import datetime
 from language_utils import load_translations, get_translator
 
 TRANSLATIONS = load_translations()
-from solver2 import load_data, preprocess_data_with_reasons, preprocess_shunting_costs, solve_primary_assignment
 
 # --- Metro Lines Configuration ---
 METRO_LINES = {
@@ -19,269 +18,723 @@ METRO_LINES = {
     "Line E (Long Express: 100km)": 1100,
 }
 
-# --- Initialize Session State ---
-if 'optimization_results' not in st.session_state:
-    st.session_state.optimization_results = None
-if 'data_frames' not in st.session_state:
-    st.session_state.data_frames = None
-if 'scenario' not in st.session_state:
-    st.session_state.scenario = None
-if 'selected_line' not in st.session_state:
-    st.session_state.selected_line = None
-if 'eligibility_details' not in st.session_state:
-    st.session_state.eligibility_details = None
-if 'required_hours' not in st.session_state:
-    st.session_state.required_hours = None
-if 'lang' not in st.session_state:
-    st.session_state.lang = "en"
+# Lines at or above the average daily distance are treated as long lines
+AVG_LINE_DISTANCE = sum(METRO_LINES.values()) / len(METRO_LINES)
+LINE_IS_LONG = {line: distance >= AVG_LINE_DISTANCE for line, distance in METRO_LINES.items()}
 
-# --- Sidebar Configuration ---
-with st.sidebar:
-    languages = {
-        "en": "English",
-        "hi": "हिंदी (Hindi)",
-        "ml": "മലയാളം (Malayalam)"
-    }
+# Chart colour per assignment status
+STATUS_COLORS = {'Revenue Service': '#22c55e', 'Standby': '#f59e0b', 'Maintenance': '#ef4444'}
+
+# Table row styling per assignment status (Fleet Status tab)
+STATUS_ROW_STYLES = {
+    'Revenue Service': {'background-color': '#dcfce7', 'color': '#15803d'},
+    'Standby': {'background-color': '#fef3c7', 'color': '#92400e'},
+    'Maintenance': {'background-color': '#fee2e2', 'color': '#991b1b'},
+}
+
+# Detailed View column configs, built once at import instead of per keystroke
+_DETAIL_COLS_SIMPLE = {
+    "Trainset ID": st.column_config.TextColumn("Train ID"),
+    "Assigned Status": st.column_config.TextColumn("Status"),
+}
+_DETAIL_COLS_FULL = {
+    "Trainset ID": st.column_config.TextColumn("Train ID", width="small"),
+    "Assigned Status": st.column_config.TextColumn("Status", width="small", help="Current assignment status"),
+    "Detailed Reasoning": st.column_config.TextColumn("Reasoning", width="large"),
+}
+
+# Wall-clock limit handed to CP-SAT; part of the solver cache key
+SOLVER_TIME_LIMIT = 60.0
+
+# Fleets larger than this draw mileage points with WebGL (Scattergl) instead of SVG box traces
+WEBGL_POINT_THRESHOLD = 1000
+
+# Expired-certificate alerts listed in full before the rest are summarized in a caption
+MAX_ALERT_MESSAGES = 50
+
+# --- Static Page Assets (built once per process, not per rerun) ---
+def _minify_css(css):
+    """Strips comments and collapses whitespace so less CSS is sent to the browser on each rerun."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    return re.sub(r'\s+', ' ', css).strip()
+
+@st.cache_resource
+def _load_css():
+    """Reads and minifies style.css once per process; reruns reuse the same <style> string."""
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'style.css')
+    with open(css_path, encoding='utf-8') as f:
+        return _minify_css(f"<style>{f.read()}</style>")
+
+_LANDING_HTML = """
+<div style="text-align: center; padding: 3rem 1rem;">
+<h2 style="color: #6366f1; font-size: 2.2rem; margin-bottom: 1rem;">Welcome to KMRL AI Train Scheduler</h2>
+<p style="font-size: 1.15rem; color: #64748b; margin: 2rem auto; max-width: 600px;">
+Optimize your fleet operations with AI-powered scheduling. Select a scenario and target line, then click 'Optimize' to generate an intelligent train induction plan.
+</p>
+</div>
+<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;">
+<div class="feature-card">
+<div style="font-size: 3rem; margin-bottom: 1rem;">🎯</div>
+<h4 style="color: #6366f1;">Optimized Scheduling</h4>
+<p style="color: #64748b;">AI-driven decisions for maximum fleet efficiency</p>
+</div>
+<div class="feature-card">
+<div style="font-size: 3rem; margin-bottom: 1rem;">📊</div>
+<h4 style="color: #6366f1;">Data-Driven Insights</h4>
+<p style="color: #64748b;">Interactive charts and analytics for better planning</p>
+</div>
+<div class="feature-card">
+<div style="font-size: 3rem; margin-bottom: 1rem;">⚠️</div>
+<h4 style="color: #6366f1;">Proactive Alerts</h4>
+<p style="color: #64748b;">Monitor critical issues like expired certs and jobs</p>
+</div>
+</div>
+"""
+
+# --- Cached Helpers ---
+@st.cache_data(ttl=60)
+def _list_scenarios():
+    """Lists scenario folders in the working directory; new folders show up within a minute."""
+    skip = {'venv', '__pycache__', '.git', '.streamlit', 'locales'}
+    with os.scandir('.') as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir() and entry.name not in skip)
+
+def _scenario_signature(scenario):
+    """Returns (filename, mtime) pairs for a scenario's CSVs so edits invalidate cached results."""
+    return tuple(sorted(
+        (entry.name, entry.stat().st_mtime)
+        for entry in os.scandir(scenario) if entry.name.endswith('.csv')
+    ))
+
+@st.cache_data(show_spinner=False)
+def _load_scenario(scenario, signature):
+    """
+    Loads and preprocesses a scenario once per signature. `signature` is only part of the cache key.
+    """
+    from solver2 import load_data, preprocess_data_with_reasons, preprocess_shunting_costs
+    data_frames = load_data(scenario)
+    if not data_frames:
+        return None, None, None
+    eligibility_details = preprocess_data_with_reasons(data_frames)
+    shunting_costs_dict = preprocess_shunting_costs(data_frames.get("layout_costs"))
+    return data_frames, eligibility_details, shunting_costs_dict
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _solve_scenario(scenario, signature, time_limit, weights, _hint=None):
+    """
+    Solves a scenario once per (scenario, signature, time limit, weights). The warm-start `_hint` is not part of the cache key.
+    """
+    from solver2 import solve_primary_assignment
+    data_frames, eligibility_details, shunting_costs_dict = _load_scenario(scenario, signature)
+    return solve_primary_assignment(data_frames, eligibility_details, shunting_costs_dict, time_limit, hint=_hint, weights=weights)
+
+@st.cache_data(show_spinner=False)
+def _operational_alerts(scenario, signature, today):
+    """
+    Returns the certificates expired as of `today`, open critical job counts per train (in first-seen
+    order) and open job man-hours per train for a scenario.
+    """
+    data_frames, _, _ = _load_scenario(scenario, signature)
+    certificates = data_frames['certificates']
+    expired_certs = certificates[certificates['expiry_date'] < pd.Timestamp(today)]
+    job_cards = data_frames['job_cards']
+    open_jobs = job_cards[job_cards['status'] == 'OPEN']
+    critical_counts = open_jobs[open_jobs['is_critical'] == True].groupby('trainset_id', sort=False, observed=True).size()
+    open_hours = open_jobs.groupby('trainset_id', observed=True)['required_man_hours'].sum().to_dict()
+    return expired_certs, critical_counts, open_hours
+
+@st.cache_resource
+def _register_plotly_template():
+    """
+    Registers the shared 'kmrl' chart layout once per process and layers it over Streamlit's default template.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    pio.templates['kmrl'] = go.layout.Template(layout=dict(
+        showlegend=True,
+        height=400,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    ))
+    if 'kmrl' not in pio.templates.default:
+        pio.templates.default = f"{pio.templates.default}+kmrl"
+
+@st.cache_resource(show_spinner=False)
+def _status_pie_figure(status_items):
+    """Fleet status pie, cached per (status, count) tuple and shared read-only."""
+    import plotly.graph_objects as go
+    # Typed arrays serialize on Plotly's fast path
+    pie_labels = np.array([status for status, _ in status_items])
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=pie_labels,
+        values=np.array([count for _, count in status_items]),
+        hole=.3,
+        marker=dict(colors=[STATUS_COLORS.get(status, '#94a3b8') for status in pie_labels]),
+        textfont=dict(size=14, color='white'),
+        textposition='inside',
+        textinfo='percent+label'
+    )])
+    fig_pie.update_layout(title="Fleet Status Distribution")
+    return fig_pie
+
+@st.cache_resource(show_spinner=False)
+def _mileage_box_figure(mileage_df):
+    """Mileage-by-status chart, cached on the solution/mileage frame's contents."""
+    import plotly.graph_objects as go
+    use_webgl = len(mileage_df) > WEBGL_POINT_THRESHOLD
+    fig_box = go.Figure()
+    # Typed NumPy arrays per status (already int32 after load) go out as base64 typed arrays
+    for status, data in mileage_df.groupby('Assigned Status', sort=False)['cumulative_mileage_km']:
+        data = data.to_numpy()
+        color = STATUS_COLORS.get(status, '#94a3b8')
+        if use_webgl:
+            fig_box.add_trace(go.Scattergl(
+                x=[status] * len(data),
+                y=data,
+                name=status,
+                mode='markers',
+                marker_color=color
+            ))
+        else:
+            fig_box.add_trace(go.Box(
+                y=data,
+                name=status,
+                marker_color=color,
+                boxmean='sd'
+            ))
+    
+    fig_box.update_layout(title="Mileage Distribution by Status", yaxis_title="Cumulative Mileage (km)")
+    return fig_box
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df):
+    """Serializes a DataFrame to UTF-8 CSV bytes once per distinct frame contents."""
+    # Encode straight into a byte buffer instead of building the whole CSV as a str first
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+# --- Fragments ---
+@st.fragment(run_every="60s")
+def _sidebar_clock():
+    """Sidebar clock that refreshes itself every minute without rerunning the whole script."""
+    st.info(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+@st.fragment
+def _detailed_view(solution_df):
+    """Search/filter table for the Detailed View tab; reruns on its own when its widgets change."""
+    st.markdown("### 📋 Detailed Train Information")
     
-    selected_lang_display = st.selectbox(
-        "🌐 Language",
-        options=list(languages.values()),
-        index=list(languages.keys()).index(st.session_state.lang)
+    # Search and Filter
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        search_train = st.text_input("🔍 Search Train ID", placeholder="e.g., KMRL-T01")
+    with col2:
+        filter_status = st.selectbox("Filter by Status", ["All"] + list(solution_df['Assigned Status'].unique()))
+    with col3:
+        show_reasoning = st.checkbox("Show Reasoning", value=False)
+    
+    # Apply filters as one boolean mask; plain substring match on the pre-lowercased IDs
+    mask = np.ones(len(solution_df), dtype=bool)
+    if search_train:
+        mask &= np.char.find(st.session_state.ids_lower, search_train.lower()) >= 0
+    if filter_status != "All":
+        mask &= (solution_df['Assigned Status'] == filter_status).to_numpy()
+    display_df = solution_df[mask]
+    
+    # Add detailed reasoning if available
+    if show_reasoning:
+        reasoning = display_df['Trainset ID'].map(st.session_state.reason_by_id).fillna('Unknown issue')
+        display_df = display_df.assign(**{'Detailed Reasoning': reasoning})
+    
+    # Display table
+    if show_reasoning and 'Detailed Reasoning' in display_df.columns:
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config=_DETAIL_COLS_FULL
+        )
+    else:
+        # Simplified view
+        st.dataframe(
+            display_df[['Trainset ID', 'Assigned Status']],
+            use_container_width=True,
+            hide_index=True,
+            column_config=_DETAIL_COLS_SIMPLE
+        )
+    
+    # Summary stats
+    st.markdown(f"**Showing {len(display_df)} of {len(solution_df)} trains**")
+
+@st.fragment
+def _tab_editor():
+    """Scenario builder: edit the CSVs of `test_case` (seeded from `simple_case`) and save them."""
+    st.markdown("### 📝 Custom Scenario Builder")
+    st.info(
+        "Use this panel to create or edit your own scenario. "
+        "The data is saved into a folder named `test_case`, which you can then select in the sidebar to run an optimization."
     )
-    st.session_state.lang = [code for code, name in languages.items() if name == selected_lang_display][0]
 
-    # Initialize the translator for the selected language
-    t = get_translator(TRANSLATIONS, st.session_state.lang)
+    TEST_CASE_DIR = 'test_case'
+    # Use 'simple_case' as a starting template if 'test_case' doesn't exist
+    TEMPLATE_DIR = 'simple_case' 
+    
+    DATA_FILES = {
+        "trainsets": "trainsets_master.csv",
+        "certificates": "fitness_certificates.csv",
+        "job_cards": "job_cards_maximo.csv",
+        "slas": "branding_slas.csv",
+        "resources": "depot_resources.csv",
+        "layout_costs": "depot_layout_costs.csv"
+    }
 
-# --- Page Configuration ---
-st.set_page_config(
-    page_title="KMRL AI Train Scheduler",
-    page_icon="🚊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+    # Load data from test_case or the template directory
+    loaded_data = {}
+    source_dir_display = ""
+    for key, filename in DATA_FILES.items():
+        # Prefer test_case if it exists, otherwise fall back to template
+        load_dir = TEST_CASE_DIR if os.path.exists(os.path.join(TEST_CASE_DIR, filename)) else TEMPLATE_DIR
+        source_dir_display = load_dir # For displaying message to user
+        try:
+            filepath = os.path.join(load_dir, filename)
+            loaded_data[key] = pd.read_csv(filepath)
+        except FileNotFoundError:
+            st.error(f"Template file not found: {os.path.join(TEMPLATE_DIR, filename)}")
+            loaded_data[key] = pd.DataFrame() # Fallback to empty DataFrame
 
-# --- Custom CSS for Modern UI with Dark Mode Support ---
-st.markdown("""
-<style>
-    /* Main container styling */
-    .main {
-        padding: 0rem 1rem;
-    }
+    st.caption(f"Currently displaying data loaded from the `{source_dir_display}` directory. Edit below and save to update `test_case`.")
+    st.markdown("---")
+
+    # Create data editors for each file within an expander
+    edited_data = {}
+    with st.expander("Trainsets Master (`trainsets_master.csv`)", expanded=True):
+        edited_data['trainsets'] = st.data_editor(
+            loaded_data['trainsets'], num_rows="dynamic", use_container_width=True, key="editor_trainsets"
+        )
+    with st.expander("Fitness Certificates (`fitness_certificates.csv`)"):
+        edited_data['certificates'] = st.data_editor(
+            loaded_data['certificates'], num_rows="dynamic", use_container_width=True, key="editor_certs"
+        )
+    with st.expander("Job Cards (`job_cards_maximo.csv`)"):
+        edited_data['job_cards'] = st.data_editor(
+            loaded_data['job_cards'], num_rows="dynamic", use_container_width=True, key="editor_jobs"
+        )
+    with st.expander("Branding SLAs (`branding_slas.csv`)"):
+        edited_data['slas'] = st.data_editor(
+            loaded_data['slas'], num_rows="dynamic", use_container_width=True, key="editor_slas"
+        )
+    with st.expander("Depot Resources (`depot_resources.csv`)"):
+        edited_data['resources'] = st.data_editor(
+            loaded_data['resources'], num_rows="dynamic", use_container_width=True, key="editor_resources"
+        )
+    with st.expander("Depot Layout Costs (`depot_layout_costs.csv`)"):
+        edited_data['layout_costs'] = st.data_editor(
+            loaded_data['layout_costs'], num_rows="dynamic", use_container_width=True, key="editor_layout"
+        )
+
+    st.markdown("---")
     
-    /* Header redesign with subtle gradient */
-    .main-header {
-        background: linear-gradient(90deg, rgba(99, 102, 241, 0.1) 0%, rgba(139, 92, 246, 0.1) 100%);
-        border: 1px solid rgba(99, 102, 241, 0.2);
-        padding: 2.5rem;
-        border-radius: 16px;
-        margin-bottom: 2rem;
-        backdrop-filter: blur(10px);
-    }
+    # Save button logic
+    if st.button("💾 Save Data to 'test_case'", type="primary", use_container_width=True):
+        with st.spinner("Saving your custom data..."):
+            os.makedirs(TEST_CASE_DIR, exist_ok=True)
+            for key, df in edited_data.items():
+                filepath = os.path.join(TEST_CASE_DIR, DATA_FILES[key])
+                df.to_csv(filepath, index=False)
+            _list_scenarios.clear()  # make a newly created test_case selectable right away
+        # The editor is a fragment, so rerun the whole app to refresh the sidebar's scenario list
+        st.session_state.editor_saved = True
+        st.rerun(scope="app")
+    if st.session_state.pop('editor_saved', False):
+        st.success(f"✅ Data saved successfully to the `{TEST_CASE_DIR}` folder!")
+        st.info("The scenario is now ready. Select `test_case` from the sidebar and click 'Optimize'.")
+
+@st.fragment
+def _tab_fleet_status(status_groups, no_trains):
+    """Three-column overview of trains grouped by assigned status."""
+    st.markdown("### Fleet Assignment Overview")
     
-    .header-title {
-        color: #6366f1;
-        font-size: 2.8rem;
-        font-weight: 700;
-        margin: 0;
-        text-align: center;
-        letter-spacing: -0.02em;
-    }
+    # Create three columns for different statuses
+    col1, col2, col3 = st.columns(3)
     
-    .header-subtitle {
-        color: #64748b;
-        font-size: 1.1rem;
-        text-align: center;
-        margin-top: 0.5rem;
-        font-weight: 400;
-    }
+    with col1:
+        st.markdown("#### 🟢 Revenue Service")
+        service_trains = status_groups.get('Revenue Service', no_trains)
+        if not service_trains.empty:
+            st.caption("Ready for passenger operations")
+            st.dataframe(
+                service_trains[['Trainset ID']].style.set_properties(**STATUS_ROW_STYLES['Revenue Service']),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No trains in revenue service")
     
-    /* Dark mode adjustments */
-    @media (prefers-color-scheme: dark) {
-        .main-header {
-            background: linear-gradient(90deg, rgba(99, 102, 241, 0.15) 0%, rgba(139, 92, 246, 0.15) 100%);
-            border: 1px solid rgba(99, 102, 241, 0.3);
-        }
-        .header-title {
-            color: #a5b4fc;
-        }
-        .header-subtitle {
-            color: #94a3b8;
-        }
-    }
+    with col2:
+        st.markdown("#### 🟡 Standby")
+        standby_trains = status_groups.get('Standby', no_trains)
+        if not standby_trains.empty:
+            st.caption("Reserve capacity available")
+            st.dataframe(
+                standby_trains[['Trainset ID']].style.set_properties(**STATUS_ROW_STYLES['Standby']),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No trains on standby")
     
-    /* Center tabs and make them full width */
-    .stTabs {
-        width: 100%;
-    }
+    with col3:
+        st.markdown("#### 🔴 Maintenance")
+        maintenance_trains = status_groups.get('Maintenance', no_trains)
+        if not maintenance_trains.empty:
+            st.caption("Scheduled for maintenance")
+            st.dataframe(
+                maintenance_trains[['Trainset ID']].style.set_properties(**STATUS_ROW_STYLES['Maintenance']),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No trains in maintenance")
+
+@st.fragment
+def _tab_analytics(status_counts, data_frames, mileage_stats, kpis):
+    """Status and mileage charts plus headline optimization metrics."""
+    _register_plotly_template()
+    st.markdown("### 📊 Operational Analytics")
     
-    .stTabs [data-baseweb="tab-list"] {
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        background: transparent;
-        border-bottom: 2px solid rgba(99, 102, 241, 0.1);
-        padding-bottom: 0;
-    }
+    col1, col2 = st.columns(2)
     
-    .stTabs [data-baseweb="tab"] {
-        flex-grow: 1;
-        max-width: 200px;
-        height: 48px;
-        background-color: transparent;
-        border: none;
-        border-radius: 12px 12px 0 0;
-        color: #64748b;
-        font-weight: 500;
-        font-size: 0.95rem;
-        transition: all 0.3s ease;
-        padding: 0.75rem 1.5rem;
-    }
+    with col1:
+        st.plotly_chart(_status_pie_figure(tuple(status_counts.items())), use_container_width=True)
     
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: rgba(99, 102, 241, 0.05);
-        color: #6366f1;
-    }
+    with col2:
+        # Mileage Analysis
+        if 'trainsets' in data_frames:
+            st.plotly_chart(_mileage_box_figure(st.session_state.solution_mileage), use_container_width=True)
     
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
-        color: white !important;
-        box-shadow: 0 4px 12px rgba(99, 102, 241, 0.25);
-    }
+    # Additional metrics as native metric widgets
+    st.markdown("### 🎯 Optimization Metrics")
     
-    /* Metric cards with better colors */
-    .metric-container {
-        background: white;
-        border: 1px solid #e2e8f0;
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-        transition: all 0.3s ease;
-    }
+    col1, col2, col3 = st.columns(3)
     
-    .metric-container:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(99, 102, 241, 0.1);
-        border-color: #cbd5e1;
-    }
+    with col1:
+        avg_mileage = mileage_stats['mean']
+        st.metric("Average Fleet Mileage", f"{avg_mileage:,.0f} km")
     
-    /* Dark mode metric cards */
-    @media (prefers-color-scheme: dark) {
-        .metric-container {
-            background: rgba(30, 41, 59, 0.5);
-            border: 1px solid rgba(148, 163, 184, 0.2);
-        }
-        .metric-container:hover {
-            border-color: rgba(99, 102, 241, 0.4);
+    with col2:
+        if 'resources' in data_frames:
+            ibl_capacity = data_frames['resources'][data_frames['resources']['resource_id'] == 'IBL_Bays']['available_capacity'].iloc[0]
+            utilization = (kpis['maintenance']/ibl_capacity)*100 if ibl_capacity > 0 else 0
+            st.metric("IBL Bay Utilization", f"{kpis['maintenance']}/{ibl_capacity}", f"{utilization:.0f}% utilized")
+    
+    with col3:
+        if 'slas' in data_frames:
+            active_slas = len(data_frames['slas'][data_frames['slas']['current_exposure_hours'] < data_frames['slas']['target_exposure_hours']])
+            st.metric("Active Branding SLAs", active_slas, "Contracts active")
+
+@st.fragment
+def _tab_recommendations(solution_dict, selected_line, eligibility_details, required_hours, mileage_stats):
+    """Fleet ranked for the selected metro line, with per-train reasoning and a line summary."""
+    st.markdown(f"### 🎯 Train Recommendations for {selected_line}")
+    
+    # Build train details in one vectorized pass from the per-train lookups built at optimization time
+    avg_fleet_mileage = mileage_stats['mean']
+    
+    trains = pd.DataFrame({'id': list(solution_dict), 'status': list(solution_dict.values())})
+    trains['mileage'] = trains['id'].map(st.session_state.mileage_by_id)
+    trains['mileage_vs_avg'] = (trains['mileage'] - avg_fleet_mileage) / avg_fleet_mileage * 100
+    trains['pending_work_hrs'] = trains['id'].map(required_hours).fillna(0)
+    # reindex rather than map: map() cannot take an empty datetime lookup (every certificate expired)
+    trains['next_cert_expiry'] = st.session_state.next_expiry_by_train.reindex(trains['id']).to_numpy()
+    
+    line_distance = METRO_LINES[selected_line]
+    is_long_line = LINE_IS_LONG[selected_line]
+    
+    # Sort based on line characteristics: service trains by mileage (direction depends on line),
+    # then standby and maintenance by ascending mileage
+    if is_long_line:
+        sort_logic = "Low Mileage trains prioritized (better for long routes)"
+    else:
+        sort_logic = "High Mileage trains prioritized (better for short routes)"
+    
+    is_service = trains['status'] == 'Revenue Service'
+    sort_mileage = trains['mileage'].where(is_long_line | ~is_service, -trains['mileage'])
+    ranked = (
+        trains.assign(_group=trains['status'].map({'Revenue Service': 0, 'Standby': 1, 'Maintenance': 2}), _mileage=sort_mileage)
+        .sort_values(['_group', '_mileage'], kind='stable')
+        .drop(columns=['_group', '_mileage'])
+    )
+    
+    # Display line information
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.info(f"**Line Distance**: {line_distance}km daily")
+    with col2:
+        st.info(f"**Line Type**: {'Long Line' if is_long_line else 'Short Line'}")
+    with col3:
+        st.info(f"**Strategy**: {sort_logic}")
+    
+    st.markdown("---")
+    
+    # Display ranked recommendations
+    st.markdown("#### 🏆 Ranked Train Recommendations")
+    
+    # Create a detailed dataframe for display; reasoning is picked per row with np.select
+    eligibility = pd.DataFrame.from_dict(eligibility_details, orient='index')
+    eligible = ranked['id'].map(eligibility['is_eligible']).to_numpy(dtype=bool)
+    status = ranked['status']
+    mileage = ranked['mileage']
+    pending_hrs = ranked['pending_work_hrs'].astype(int).astype(str) + " hrs"
+    reasoning = np.select(
+        [
+            ~eligible,
+            (status == 'Revenue Service') & (mileage < avg_fleet_mileage),
+            status == 'Revenue Service',
+            status == 'Maintenance',
+            (status == 'Standby') & (mileage > avg_fleet_mileage),
+            status == 'Standby',
+        ],
+        [
+            ranked['id'].map(eligibility['reason']).to_numpy(dtype=object),
+            "Ready for service (Low Mileage)",
+            "Ready for service (High Mileage)",
+            ("Scheduled maintenance (" + pending_hrs + ")").to_numpy(dtype=object),
+            "Eligible, held for fleet balancing (high mileage)",
+            "Eligible operational spare",
+        ],
+        default=""
+    )
+    
+    # Display as dataframe with enhanced formatting
+    recommendations_df = pd.DataFrame({
+        "Rank": np.arange(1, len(ranked) + 1),
+        "Train ID": ranked['id'].to_numpy(),
+        "Status": status.map({'Revenue Service': "🟢 Revenue Service", 'Standby': "🟡 Standby"}).fillna("🔴 Maintenance").to_numpy(),
+        "Mileage vs Avg": ranked['mileage_vs_avg'].map("{:+.1f}%".format).to_numpy(),
+        "Next Cert Expiry": ranked['next_cert_expiry'].dt.strftime("%Y-%m-%d").fillna("N/A").to_numpy(),
+        "Pending Work": pending_hrs.to_numpy(),
+        "Reasoning": reasoning
+    })
+    
+    st.dataframe(
+        recommendations_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Rank": st.column_config.NumberColumn("Rank", width="small"),
+            "Train ID": st.column_config.TextColumn("Train ID", width="medium"),
+            "Status": st.column_config.TextColumn("Status", width="medium"),
+            "Mileage vs Avg": st.column_config.TextColumn("Mileage vs Avg", width="small"),
+            "Next Cert Expiry": st.column_config.TextColumn("Next Cert Expiry", width="medium"),
+            "Pending Work": st.column_config.TextColumn("Pending Work", width="small"),
+            "Reasoning": st.column_config.TextColumn("Reasoning", width="large")
         }
-    }
+    )
     
-    /* Status cards with softer colors */
-    .status-card {
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 0.5rem;
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
+    # Summary statistics for the line
+    st.markdown("---")
+    st.markdown("#### 📈 Line Assignment Summary")
     
-    .status-card:hover {
-        transform: translateX(4px);
-    }
+    col1, col2, col3, col4 = st.columns(4)
     
-    .service-card {
-        background: linear-gradient(135deg, #dcfce7 0%, #bbf7d0 100%);
-        border-left: 4px solid #22c55e;
-        color: #15803d;
-    }
+    # One grouped pass gives every per-status figure below
+    summary = trains.groupby('status', sort=False).agg(
+        count=('id', 'size'), avg_mileage=('mileage', 'mean'), pending=('pending_work_hrs', 'sum')
+    ).reindex(['Revenue Service', 'Standby', 'Maintenance'], fill_value=0)
     
-    .standby-card {
-        background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
-        border-left: 4px solid #f59e0b;
-        color: #92400e;
-    }
+    ready_for_line = int(summary.at['Revenue Service', 'count'])
+    with col1:
+        st.metric("Ready for Service", ready_for_line, f"Top {min(3, ready_for_line)} recommended")
+        
+    avg_ready_mileage = summary.at['Revenue Service', 'avg_mileage']
+    with col2:
+        st.metric("Avg Service Mileage", f"{avg_ready_mileage:,.0f} km", "For active trains")
+        
+    backup_available = int(summary.at['Standby', 'count'])
+    with col3:
+        st.metric("Backup Available", backup_available, "Reserve capacity")
+        
+    total_maintenance_hours = summary.at['Maintenance', 'pending']
+    with col4:
+        st.metric("Maintenance Backlog", f"{total_maintenance_hours:.0f} hrs", f"{int(summary.at['Maintenance', 'count'])} trains")
+
+@st.fragment
+def _tab_alerts(data_frames, status_groups, no_trains):
+    """Critical certificate/job-card issues and the head of the maintenance queue."""
+    st.markdown("### ⚠️ Operational Alerts & Notifications")
     
-    .maintenance-card {
-        background: linear-gradient(135deg, #fee2e2 0%, #fecaca 100%);
-        border-left: 4px solid #ef4444;
-        color: #991b1b;
-    }
+    col1, col2 = st.columns(2)
     
-    /* Dark mode status cards */
-    @media (prefers-color-scheme: dark) {
-        .service-card {
-            background: linear-gradient(135deg, rgba(34, 197, 94, 0.15) 0%, rgba(34, 197, 94, 0.25) 100%);
-            color: #86efac;
-        }
-        .standby-card {
-            background: linear-gradient(135deg, rgba(245, 158, 11, 0.15) 0%, rgba(245, 158, 11, 0.25) 100%);
-            color: #fbbf24;
-        }
-        .maintenance-card {
-            background: linear-gradient(135deg, rgba(239, 68, 68, 0.15) 0%, rgba(239, 68, 68, 0.25) 100%);
-            color: #fca5a5;
-        }
-    }
+    with col1:
+        st.markdown("#### 🚨 Critical Issues")
+        
+        critical_count = 0
+        expired_certs, critical_counts, open_hours = _operational_alerts(
+            st.session_state.scenario, st.session_state.signature, datetime.now().date()
+        )
+        
+        # Check for certificate issues
+        if 'certificates' in data_frames:
+            if not expired_certs.empty:
+                # Build every message in one vectorized pass and show them in a single alert box
+                messages = (
+                    "❌ " + expired_certs['trainset_id'].astype(str) + ": "
+                    + expired_certs['certificate_type'].astype(str) + " certificate expired"
+                )
+                st.error("\n\n".join(messages.head(MAX_ALERT_MESSAGES)))
+                if len(messages) > MAX_ALERT_MESSAGES:
+                    st.caption(f"... and {len(messages) - MAX_ALERT_MESSAGES} more expired certificates")
+                critical_count += len(messages)
+        
+        # Check for critical job cards
+        if 'job_cards' in data_frames:
+            if not critical_counts.empty:
+                for train, job_count in critical_counts.head(5).items():  # Show first 5
+                    st.warning(f"⚠️ {train}: {job_count} critical job(s) pending")
+                    critical_count += 1
+        
+        if critical_count == 0:
+            st.success("✅ No critical issues detected")
     
-    /* Improved metric styling */
-    [data-testid="metric-container"] {
-        background: white;
-        border: 1px solid #e2e8f0;
-        padding: 1.2rem;
-        border-radius: 12px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    }
+    with col2:
+        st.markdown("#### 📋 Maintenance Queue")
+        
+        maintenance_trains = status_groups.get('Maintenance', no_trains)['Trainset ID'].tolist()
+        if maintenance_trains:
+            for i, train in enumerate(maintenance_trains[:5], 1):  # Show top 5
+                if 'job_cards' in data_frames:
+                    hours = open_hours.get(train, 0)
+                    st.info(f"{i}. {train} - Est. {hours:.0f}h work")
+                else:
+                    st.info(f"{i}. {train}")
+            
+            if len(maintenance_trains) > 5:
+                st.caption(f"... and {len(maintenance_trains) - 5} more")
+        else:
+            st.success("✅ No trains in maintenance queue")
+
+@st.fragment
+def _tab_reports(solution_df, data_frames, kpis, mileage_stats):
+    """Schedule export and executive summary tables."""
+    st.markdown("### 📋 Reports & Export Options")
     
-    @media (prefers-color-scheme: dark) {
-        [data-testid="metric-container"] {
-            background: rgba(30, 41, 59, 0.5);
-            border: 1px solid rgba(148, 163, 184, 0.2);
-        }
-    }
+    col1, col2, col3 = st.columns(3)
     
-    /* Landing page cards */
-    .feature-card {
-        background: white;
-        border: 1px solid #e2e8f0;
-        padding: 2rem;
-        border-radius: 12px;
-        text-align: center;
-        transition: all 0.3s ease;
-    }
+    with col1:
+        st.markdown("##### Schedule Export")
+        csv = _csv_bytes(solution_df)
+        st.download_button(
+            label="📥 Download Schedule (CSV)",
+            data=csv,
+            file_name=f"train_schedule_{st.session_state.scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
     
-    .feature-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 8px 24px rgba(99, 102, 241, 0.1);
-        border-color: #6366f1;
-    }
+    with col2:
+        st.markdown("##### Analytics Report")
+        if st.button("📊 Generate Analytics Report", use_container_width=True):
+            st.info("Feature coming soon: Comprehensive PDF report with charts")
     
-    @media (prefers-color-scheme: dark) {
-        .feature-card {
-            background: rgba(30, 41, 59, 0.5);
-            border: 1px solid rgba(148, 163, 184, 0.2);
-        }
-        .feature-card:hover {
-            border-color: rgba(99, 102, 241, 0.6);
-        }
-    }
+    with col3:
+        st.markdown("##### Email Notification")
+        if st.button("📧 Send Email Report", use_container_width=True):
+            st.info("Feature coming soon: Automated email notifications")
     
-    /* Remove default Streamlit padding for tabs */
-    .stTabs [data-baseweb="tab-panel"] {
-        padding-top: 2rem;
-    }
+    st.markdown("---")
     
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(99, 102, 241, 0.03) 0%, rgba(139, 92, 246, 0.03) 100%);
-    }
+    # Summary Statistics Table
+    st.markdown("### 📈 Executive Summary")
     
-    @media (prefers-color-scheme: dark) {
-        section[data-testid="stSidebar"] {
-            background: linear-gradient(180deg, rgba(99, 102, 241, 0.05) 0%, rgba(139, 92, 246, 0.05) 100%);
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        operational = kpis['in_service'] + kpis['standby']
+        summary_data = {
+            "Metric": [
+                "Total Fleet Size",
+                "Operational Trains",
+                "Maintenance Backlog",
+                "Average Utilization"
+            ],
+            "Value": [
+                f"{kpis['total_trains']}",
+                f"{operational}",
+                f"{kpis['maintenance']}",
+                f"{(operational/kpis['total_trains'])*100:.1f}%" if kpis['total_trains'] > 0 else "0.0%"
+            ]
         }
+        summary_df = pd.DataFrame(summary_data)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+    
+    with col2:
+        if 'trainsets' in data_frames:
+            mileage_display = {
+                "Statistic": [
+                    "Min Mileage",
+                    "Max Mileage", 
+                    "Average Mileage",
+                    "Std Deviation"
+                ],
+                "Value (km)": [
+                    f"{mileage_stats['min']:,.0f}",
+                    f"{mileage_stats['max']:,.0f}",
+                    f"{mileage_stats['mean']:,.0f}",
+                    f"{mileage_stats['std']:,.0f}"
+                ]
+            }
+            mileage_df = pd.DataFrame(mileage_display)
+            st.dataframe(mileage_df, use_container_width=True, hide_index=True)
+
+# --- Initialize Session State ---
+# Everything derived from an optimization run; cleared together so no tab sees a previous scenario's objects
+_RESULT_STATE_KEYS = (
+    'optimization_results', 'data_frames', 'scenario', 'signature', 'selected_line', 'eligibility_details',
+    'required_hours', 'solution_df', 'status_groups', 'ids_lower', 'reason_by_id', 'status_counts', 'kpis',
+    'mileage_stats', 'solution_mileage', 'mileage_by_id', 'next_expiry_by_train',
+)
+
+def _reset_results():
+    """Drops every optimization-derived session value."""
+    for key in _RESULT_STATE_KEYS:
+        st.session_state[key] = None
+
+for key in _RESULT_STATE_KEYS:
+    if key not in st.session_state:
+        st.session_state[key] = None
+if 'lang' not in st.session_state:
+    st.session_state.lang = "en"
+
+# --- Sidebar Configuration ---
+with st.sidebar:
+    languages = {
+        "en": "English",
+        "hi": "हिंदी (Hindi)",
+        "ml": "മലയാളം (Malayalam)"
     }
-</style>
-""", unsafe_allow_html=True)
+    
+    selected_lang_display = st.selectbox(
+        "🌐 Language",
+        options=list(languages.values()),
+        index=list(languages.keys()).index(st.session_state.lang)
+    )
+    st.session_state.lang = [code for code, name in languages.items() if name == selected_lang_display][0]
+
+    # Initialize the translator for the selected language
+    t = get_translator(TRANSLATIONS, st.session_state.lang)
+
+# --- Page Configuration ---
+st.set_page_config(
+    page_title="KMRL AI Train Scheduler",
+    page_icon="🚊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# --- Custom CSS for Modern UI with Dark Mode Support ---
+st.markdown(_load_css(), unsafe_allow_html=True)
 
 # --- Header Section ---
 st.markdown(f"""
@@ -295,7 +748,7 @@ with st.sidebar:
     st.markdown(f"### {t('config_panel_title')}")
     
     # Scenario Selection
-    scenarios = [d for d in os.listdir('.') if os.path.isdir(d) and d not in ['venv', '__pycache__', '.git', '.streamlit', 'locales']]
+    scenarios = _list_scenarios()
     
     if scenarios:
         selected_scenario = st.selectbox(
@@ -317,8 +770,7 @@ with st.sidebar:
         
         # Display line characteristics
         line_distance = METRO_LINES[selected_line]
-        avg_line_distance = sum(METRO_LINES.values()) / len(METRO_LINES)
-        line_type = t("line_type_long") if line_distance >= avg_line_distance else t("line_type_short")
+        line_type = t("line_type_long") if LINE_IS_LONG[selected_line] else t("line_type_short")
         
         st.info(f"📏 **{selected_line}**: {line_distance}km daily distance ({line_type})")
         
@@ -332,8 +784,7 @@ with st.sidebar:
             clear_results = st.button(t("clear_button"), use_container_width=True)
         
         if clear_results:
-            st.session_state.optimization_results = None
-            st.session_state.data_frames = None
+            _reset_results()
             st.rerun()
     else:
         st.error(t("no_scenario_error"))
@@ -345,29 +796,69 @@ with st.sidebar:
     # Info Section
     st.markdown(f"### {t('system_status_header')}")
     st.success(f"✅ {t('status_operational')}")
-    st.info(f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    _sidebar_clock()
 
 # --- Main Content Area ---
 if run_optimization and selected_scenario:
     with st.spinner("🔄 Loading data and running optimization..."):
-        # Load and process data
-        data_frames = load_data(selected_scenario)
+        # Load, process and solve (cached until the scenario's CSVs change)
+        signature = _scenario_signature(selected_scenario)
+        data_frames, eligibility_details, shunting_costs_dict = _load_scenario(selected_scenario, signature)
         
         if data_frames:
-            eligibility_details = preprocess_data_with_reasons(data_frames)
-            shunting_costs_dict = preprocess_shunting_costs(data_frames.get("layout_costs"))
-            solution_dict, required_hours = solve_primary_assignment(data_frames, eligibility_details, shunting_costs_dict)
+            from solver2 import OBJECTIVE_WEIGHTS
+            solution_dict, required_hours, solve_status = _solve_scenario(
+                selected_scenario, signature, SOLVER_TIME_LIMIT, OBJECTIVE_WEIGHTS, _hint=st.session_state.optimization_results
+            )
+            if solve_status != "OPTIMAL":
+                # Keep only proven optima cached so the next Optimize retries CP-SAT, warm-started from this plan
+                _solve_scenario.clear(selected_scenario, signature, SOLVER_TIME_LIMIT, OBJECTIVE_WEIGHTS)
             
-            if solution_dict is not None:
-                st.session_state.optimization_results = solution_dict
-                st.session_state.data_frames = data_frames
-                st.session_state.scenario = selected_scenario
-                st.session_state.selected_line = selected_line
-                st.session_state.eligibility_details = eligibility_details
-                st.session_state.required_hours = required_hours
-                st.success("✅ Optimization completed successfully!")
+            _reset_results()
+            st.session_state.optimization_results = solution_dict
+            st.session_state.data_frames = data_frames
+            st.session_state.scenario = selected_scenario
+            st.session_state.signature = signature
+            st.session_state.selected_line = selected_line
+            st.session_state.eligibility_details = eligibility_details
+            st.session_state.required_hours = required_hours
+            
+            # Solution frame, status groups, counts, KPIs, fleet mileage stats and the status/mileage join
+            # only change with the solution
+            solution_df = pd.DataFrame({'Trainset ID': list(solution_dict), 'Assigned Status': list(solution_dict.values())})
+            st.session_state.solution_df = solution_df
+            st.session_state.status_groups = dict(tuple(solution_df.groupby('Assigned Status', sort=False)))
+            st.session_state.ids_lower = solution_df['Trainset ID'].str.lower().to_numpy(dtype=str)
+            st.session_state.reason_by_id = pd.Series({
+                train_id: "Eligible for service operations" if details['is_eligible'] else details['reason']
+                for train_id, details in eligibility_details.items()
+            })
+            status_counts = solution_df['Assigned Status'].value_counts()
+            st.session_state.status_counts = status_counts
+            st.session_state.kpis = {
+                'total_trains': len(solution_dict),
+                'in_service': int(status_counts.get('Revenue Service', 0)),
+                'standby': int(status_counts.get('Standby', 0)),
+                'maintenance': int(status_counts.get('Maintenance', 0)),
+            }
+            mileage = data_frames['trainsets']['cumulative_mileage_km']
+            st.session_state.mileage_stats = mileage.agg(['min', 'max', 'mean', 'std', 'count']).to_dict()
+            
+            # Per-train lookup tables so tabs map by id instead of re-masking or joining the raw frames
+            mileage_by_id = data_frames['trainsets'].drop_duplicates('trainset_id').set_index('trainset_id')['cumulative_mileage_km']
+            st.session_state.mileage_by_id = mileage_by_id
+            st.session_state.solution_mileage = solution_df.assign(
+                cumulative_mileage_km=solution_df['Trainset ID'].map(mileage_by_id)
+            )
+            certs = data_frames['certificates']
+            st.session_state.next_expiry_by_train = (
+                certs[certs['expiry_date'] >= pd.Timestamp(datetime.now().date())]
+                .groupby('trainset_id', observed=True)['expiry_date'].min()
+            )
+            if solve_status == "GREEDY":
+                st.warning("⚠️ The optimizer did not finish in time; showing a greedy fallback plan. Click Optimize again to retry.")
             else:
-                st.error("❌ No feasible solution found. Please check constraints.")
+                st.success("✅ Optimization completed successfully!")
         else:
             st.error(f"❌ Failed to load data for scenario: {selected_scenario}")
 
@@ -378,30 +869,28 @@ if st.session_state.optimization_results is not None:
     selected_line = st.session_state.selected_line
     eligibility_details = st.session_state.eligibility_details
     required_hours = st.session_state.required_hours
+    mileage_stats = st.session_state.mileage_stats
     
-    solution_df = pd.DataFrame([
-        {"Trainset ID": train_id, "Assigned Status": status}
-        for train_id, status in solution_dict.items()
-    ])
+    # Built once per optimization; tabs below look up status subframes instead of re-masking
+    solution_df = st.session_state.solution_df
+    status_groups = st.session_state.status_groups
+    status_counts = st.session_state.status_counts
+    kpis = st.session_state.kpis
+    no_trains = solution_df.iloc[0:0]
     
     # --- Key Metrics Dashboard ---
     st.markdown("## 📈 Key Performance Indicators")
     
     col1, col2, col3, col4 = st.columns(4)
     
-    total_trains = len(solution_df)
-    in_service = len(solution_df[solution_df['Assigned Status'] == 'Revenue Service'])
-    standby = len(solution_df[solution_df['Assigned Status'] == 'Standby'])
-    maintenance = len(solution_df[solution_df['Assigned Status'] == 'Maintenance'])
-    
     with col1:
-        st.metric(label="Total Fleet", value=total_trains)
+        st.metric(label="Total Fleet", value=kpis['total_trains'])
     with col2:
-        st.metric(label="🟢 Revenue Service", value=in_service)
+        st.metric(label="🟢 Revenue Service", value=kpis['in_service'])
     with col3:
-        st.metric(label="🟡 Standby", value=standby)
+        st.metric(label="🟡 Standby", value=kpis['standby'])
     with col4:
-        st.metric(label="🔴 Maintenance", value=maintenance)
+        st.metric(label="🔴 Maintenance", value=kpis['maintenance'])
     
     st.markdown("---")
     
@@ -410,600 +899,27 @@ if st.session_state.optimization_results is not None:
     tab_labels = [t(key) for key in tab_keys]
     tab_editor, tab_status, tab_analytics, tab_reco, tab_detail, tab_alerts, tab_reports = st.tabs(tab_labels)
 
-# --- New Tab: Data Editor ---
     with tab_editor:
-        st.markdown("### 📝 Custom Scenario Builder")
-        st.info(
-            "Use this panel to create or edit your own scenario. "
-            "The data is saved into a folder named `test_case`, which you can then select in the sidebar to run an optimization."
-        )
-
-        TEST_CASE_DIR = 'test_case'
-        # Use 'simple_case' as a starting template if 'test_case' doesn't exist
-        TEMPLATE_DIR = 'simple_case' 
-        
-        DATA_FILES = {
-            "trainsets": "trainsets_master.csv",
-            "certificates": "fitness_certificates.csv",
-            "job_cards": "job_cards_maximo.csv",
-            "slas": "branding_slas.csv",
-            "resources": "depot_resources.csv",
-            "layout_costs": "depot_layout_costs.csv"
-        }
-
-        # Load data from test_case or the template directory
-        loaded_data = {}
-        source_dir_display = ""
-        for key, filename in DATA_FILES.items():
-            # Prefer test_case if it exists, otherwise fall back to template
-            load_dir = TEST_CASE_DIR if os.path.exists(os.path.join(TEST_CASE_DIR, filename)) else TEMPLATE_DIR
-            source_dir_display = load_dir # For displaying message to user
-            try:
-                filepath = os.path.join(load_dir, filename)
-                loaded_data[key] = pd.read_csv(filepath)
-            except FileNotFoundError:
-                st.error(f"Template file not found: {os.path.join(TEMPLATE_DIR, filename)}")
-                loaded_data[key] = pd.DataFrame() # Fallback to empty DataFrame
-
-        st.caption(f"Currently displaying data loaded from the `{source_dir_display}` directory. Edit below and save to update `test_case`.")
-        st.markdown("---")
-
-        # Create data editors for each file within an expander
-        edited_data = {}
-        with st.expander("Trainsets Master (`trainsets_master.csv`)", expanded=True):
-            edited_data['trainsets'] = st.data_editor(
-                loaded_data['trainsets'], num_rows="dynamic", use_container_width=True, key="editor_trainsets"
-            )
-        with st.expander("Fitness Certificates (`fitness_certificates.csv`)"):
-            edited_data['certificates'] = st.data_editor(
-                loaded_data['certificates'], num_rows="dynamic", use_container_width=True, key="editor_certs"
-            )
-        with st.expander("Job Cards (`job_cards_maximo.csv`)"):
-            edited_data['job_cards'] = st.data_editor(
-                loaded_data['job_cards'], num_rows="dynamic", use_container_width=True, key="editor_jobs"
-            )
-        with st.expander("Branding SLAs (`branding_slas.csv`)"):
-            edited_data['slas'] = st.data_editor(
-                loaded_data['slas'], num_rows="dynamic", use_container_width=True, key="editor_slas"
-            )
-        with st.expander("Depot Resources (`depot_resources.csv`)"):
-            edited_data['resources'] = st.data_editor(
-                loaded_data['resources'], num_rows="dynamic", use_container_width=True, key="editor_resources"
-            )
-        with st.expander("Depot Layout Costs (`depot_layout_costs.csv`)"):
-            edited_data['layout_costs'] = st.data_editor(
-                loaded_data['layout_costs'], num_rows="dynamic", use_container_width=True, key="editor_layout"
-            )
-
-        st.markdown("---")
-        
-        # Save button logic
-        if st.button("💾 Save Data to 'test_case'", type="primary", use_container_width=True):
-            with st.spinner("Saving your custom data..."):
-                os.makedirs(TEST_CASE_DIR, exist_ok=True)
-                for key, df in edited_data.items():
-                    filepath = os.path.join(TEST_CASE_DIR, DATA_FILES[key])
-                    df.to_csv(filepath, index=False)
-            st.success(f"✅ Data saved successfully to the `{TEST_CASE_DIR}` folder!")
-            st.info("The scenario is now ready. Select `test_case` from the sidebar and click 'Optimize'.")
-            # Optional: you can add st.rerun() to automatically refresh the page
+        _tab_editor()
     
     with tab_status:
-        st.markdown("### Fleet Assignment Overview")
-        
-        # Create three columns for different statuses
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("#### 🟢 Revenue Service")
-            service_trains = solution_df[solution_df['Assigned Status'] == 'Revenue Service']
-            if not service_trains.empty:
-                for _, train in service_trains.iterrows():
-                    st.markdown(f"""
-                    <div class="status-card service-card">
-                        <strong>{train['Trainset ID']}</strong><br>
-                        <small>Ready for passenger operations</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No trains in revenue service")
-        
-        with col2:
-            st.markdown("#### 🟡 Standby")
-            standby_trains = solution_df[solution_df['Assigned Status'] == 'Standby']
-            if not standby_trains.empty:
-                for _, train in standby_trains.iterrows():
-                    st.markdown(f"""
-                    <div class="status-card standby-card">
-                        <strong>{train['Trainset ID']}</strong><br>
-                        <small>Reserve capacity available</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No trains on standby")
-        
-        with col3:
-            st.markdown("#### 🔴 Maintenance")
-            maintenance_trains = solution_df[solution_df['Assigned Status'] == 'Maintenance']
-            if not maintenance_trains.empty:
-                for _, train in maintenance_trains.iterrows():
-                    st.markdown(f"""
-                    <div class="status-card maintenance-card">
-                        <strong>{train['Trainset ID']}</strong><br>
-                        <small>Scheduled for maintenance</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No trains in maintenance")
+        _tab_fleet_status(status_groups, no_trains)
     
     with tab_analytics:
-        st.markdown("### 📊 Operational Analytics")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Status Distribution Pie Chart
-            status_counts = solution_df['Assigned Status'].value_counts()
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=status_counts.index,
-                values=status_counts.values,
-                hole=.3,
-                marker=dict(colors=['#22c55e', '#f59e0b', '#ef4444']),
-                textfont=dict(size=14, color='white'),
-                textposition='inside',
-                textinfo='percent+label'
-            )])
-            fig_pie.update_layout(
-                title="Fleet Status Distribution",
-                showlegend=True,
-                height=400,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        with col2:
-            # Mileage Analysis
-            if 'trainsets' in data_frames:
-                trainsets_df = data_frames['trainsets']
-                merged_df = pd.merge(
-                    solution_df[['Trainset ID', 'Assigned Status']],
-                    trainsets_df[['trainset_id', 'cumulative_mileage_km']],
-                    left_on='Trainset ID',
-                    right_on='trainset_id'
-                )
-                
-                fig_box = go.Figure()
-                for status in merged_df['Assigned Status'].unique():
-                    data = merged_df[merged_df['Assigned Status'] == status]['cumulative_mileage_km']
-                    color = {'Revenue Service': '#22c55e', 'Standby': '#f59e0b', 'Maintenance': '#ef4444'}.get(status, '#94a3b8')
-                    fig_box.add_trace(go.Box(
-                        y=data,
-                        name=status,
-                        marker_color=color,
-                        boxmean='sd'
-                    ))
-                
-                fig_box.update_layout(
-                    title="Mileage Distribution by Status",
-                    yaxis_title="Cumulative Mileage (km)",
-                    showlegend=True,
-                    height=400,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig_box, use_container_width=True)
-        
-        # Additional metrics in cards
-        st.markdown("### 🎯 Optimization Metrics")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            avg_mileage = data_frames['trainsets']['cumulative_mileage_km'].mean()
-            st.markdown(f"""
-            <div class="metric-container">
-                <h4 style="color: #6366f1; margin: 0;">Average Fleet Mileage</h4>
-                <p style="font-size: 1.8rem; font-weight: bold; margin: 0.5rem 0;">{avg_mileage:,.0f} km</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            if 'resources' in data_frames:
-                ibl_capacity = data_frames['resources'][data_frames['resources']['resource_id'] == 'IBL_Bays']['available_capacity'].iloc[0]
-                utilization = (maintenance/ibl_capacity)*100 if ibl_capacity > 0 else 0
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h4 style="color: #6366f1; margin: 0;">IBL Bay Utilization</h4>
-                    <p style="font-size: 1.8rem; font-weight: bold; margin: 0.5rem 0;">{maintenance}/{ibl_capacity}</p>
-                    <small style="color: #64748b;">{utilization:.0f}% utilized</small>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col3:
-            if 'slas' in data_frames:
-                active_slas = len(data_frames['slas'][data_frames['slas']['current_exposure_hours'] < data_frames['slas']['target_exposure_hours']])
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h4 style="color: #6366f1; margin: 0;">Active Branding SLAs</h4>
-                    <p style="font-size: 1.8rem; font-weight: bold; margin: 0.5rem 0;">{active_slas}</p>
-                    <small style="color: #64748b;">Contracts active</small>
-                </div>
-                """, unsafe_allow_html=True)
+        _tab_analytics(status_counts, data_frames, mileage_stats, kpis)
     
     with tab_reco:
-        st.markdown(f"### 🎯 Train Recommendations for {selected_line}")
-        
-        # Generate train recommendations similar to solver2.py logic
-        all_trains_details = []
-        avg_fleet_mileage = data_frames["trainsets"]["cumulative_mileage_km"].mean()
-        today = datetime.now().date()
-        
-        for train_id, status in solution_dict.items():
-            train_data = data_frames["trainsets"][data_frames["trainsets"]["trainset_id"] == train_id].iloc[0]
-            mileage = train_data["cumulative_mileage_km"]
-            mileage_vs_avg = ((mileage - avg_fleet_mileage) / avg_fleet_mileage) * 100
-            
-            pending_work_hrs = required_hours.get(train_id, 0)
-            
-            # Get next certificate expiry
-            future_certs = data_frames['certificates'][
-                (data_frames['certificates']['trainset_id'] == train_id) & 
-                (data_frames['certificates']['expiry_date'] >= today)
-            ]
-            next_cert_expiry = future_certs['expiry_date'].min() if not future_certs.empty else "N/A"
-
-            all_trains_details.append({
-                'id': train_id, 
-                'status': status, 
-                'mileage': mileage, 
-                'mileage_vs_avg': mileage_vs_avg,
-                'pending_work_hrs': pending_work_hrs,
-                'next_cert_expiry': next_cert_expiry,
-                'eligibility': eligibility_details[train_id]
-            })
-
-        # Sort trains based on line characteristics
-        service_trains = [t for t in all_trains_details if t['status'] == 'Revenue Service']
-        standby_trains = [t for t in all_trains_details if t['status'] == 'Standby']
-        maintenance_trains = [t for t in all_trains_details if t['status'] == 'Maintenance']
-        
-        line_distance = METRO_LINES[selected_line]
-        avg_line_distance = sum(METRO_LINES.values()) / len(METRO_LINES)
-        is_long_line = line_distance >= avg_line_distance
-        
-        # Sort based on line characteristics
-        if is_long_line:
-            service_trains.sort(key=lambda x: x['mileage'])  # Low mileage first for long lines
-            sort_logic = "Low Mileage trains prioritized (better for long routes)"
-        else:
-            service_trains.sort(key=lambda x: x['mileage'], reverse=True)  # High mileage first for short lines
-            sort_logic = "High Mileage trains prioritized (better for short routes)"
-
-        standby_trains.sort(key=lambda x: x['mileage'])
-        maintenance_trains.sort(key=lambda x: x['mileage'])
-        final_ranked_list = service_trains + standby_trains + maintenance_trains
-        
-        # Display line information
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.info(f"**Line Distance**: {line_distance}km daily")
-        with col2:
-            st.info(f"**Line Type**: {'Long Line' if is_long_line else 'Short Line'}")
-        with col3:
-            st.info(f"**Strategy**: {sort_logic}")
-        
-        st.markdown("---")
-        
-        # Display ranked recommendations
-        st.markdown("#### 🏆 Ranked Train Recommendations")
-        
-        # Create a detailed dataframe for display
-        display_data = []
-        for i, train in enumerate(final_ranked_list, 1):
-            # Generate reasoning
-            reason = ""
-            if not train['eligibility']['is_eligible']:
-                reason = train['eligibility']['reason']
-            elif train['status'] == 'Revenue Service':
-                mileage_status = "Low Mileage" if train['mileage'] < avg_fleet_mileage else "High Mileage"
-                reason = f"Ready for service ({mileage_status})"
-            elif train['status'] == 'Maintenance':
-                reason = f"Scheduled maintenance ({int(train['pending_work_hrs'])} hrs)"
-            elif train['status'] == 'Standby':
-                if train['mileage'] > avg_fleet_mileage:
-                    reason = "Eligible, held for fleet balancing (high mileage)"
-                else:
-                    reason = "Eligible operational spare"
-
-            expiry_str = str(train['next_cert_expiry']) if train['next_cert_expiry'] != "N/A" else "N/A"
-            
-            # Status color coding
-            if train['status'] == 'Revenue Service':
-                status_display = "🟢 Revenue Service"
-            elif train['status'] == 'Standby':
-                status_display = "🟡 Standby"
-            else:
-                status_display = "🔴 Maintenance"
-            
-            display_data.append({
-                "Rank": i,
-                "Train ID": train['id'],
-                "Status": status_display,
-                "Mileage vs Avg": f"{train['mileage_vs_avg']:+.1f}%",
-                "Next Cert Expiry": expiry_str,
-                "Pending Work": f"{int(train['pending_work_hrs'])} hrs",
-                "Reasoning": reason
-            })
-        
-        # Display as dataframe with enhanced formatting
-        recommendations_df = pd.DataFrame(display_data)
-        
-        st.dataframe(
-            recommendations_df,
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                "Rank": st.column_config.NumberColumn("Rank", width="small"),
-                "Train ID": st.column_config.TextColumn("Train ID", width="medium"),
-                "Status": st.column_config.TextColumn("Status", width="medium"),
-                "Mileage vs Avg": st.column_config.TextColumn("Mileage vs Avg", width="small"),
-                "Next Cert Expiry": st.column_config.TextColumn("Next Cert Expiry", width="medium"),
-                "Pending Work": st.column_config.TextColumn("Pending Work", width="small"),
-                "Reasoning": st.column_config.TextColumn("Reasoning", width="large")
-            }
-        )
-        
-        # Summary statistics for the line
-        st.markdown("---")
-        st.markdown("#### 📈 Line Assignment Summary")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        ready_for_line = len([t for t in service_trains])
-        with col1:
-            st.metric("Ready for Service", ready_for_line, f"Top {min(3, ready_for_line)} recommended")
-            
-        avg_ready_mileage = sum(t['mileage'] for t in service_trains) / len(service_trains) if service_trains else 0
-        with col2:
-            st.metric("Avg Service Mileage", f"{avg_ready_mileage:,.0f} km", "For active trains")
-            
-        backup_available = len(standby_trains)
-        with col3:
-            st.metric("Backup Available", backup_available, "Reserve capacity")
-            
-        total_maintenance_hours = sum(t['pending_work_hrs'] for t in maintenance_trains)
-        with col4:
-            st.metric("Maintenance Backlog", f"{total_maintenance_hours:.0f} hrs", f"{len(maintenance_trains)} trains")
-
+        _tab_recommendations(solution_dict, selected_line, eligibility_details, required_hours, mileage_stats)
+    
     with tab_detail:
-        st.markdown("### 📋 Detailed Train Information")
-        
-        # Search and Filter
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            search_train = st.text_input("🔍 Search Train ID", placeholder="e.g., KMRL-T01")
-        with col2:
-            filter_status = st.selectbox("Filter by Status", ["All"] + list(solution_df['Assigned Status'].unique()))
-        with col3:
-            show_reasoning = st.checkbox("Show Reasoning", value=False)
-        
-        # Apply filters
-        display_df = solution_df.copy()
-        if search_train:
-            display_df = display_df[display_df['Trainset ID'].str.contains(search_train, case=False)]
-        if filter_status != "All":
-            display_df = display_df[display_df['Assigned Status'] == filter_status]
-        
-        # Add detailed reasoning if available
-        if show_reasoning:
-            reasoning_data = []
-            for _, row in display_df.iterrows():
-                train_id = row['Trainset ID']
-                eligibility = eligibility_details.get(train_id, {})
-                if not eligibility.get('is_eligible', False):
-                    reason = eligibility.get('reason', 'Unknown issue')
-                else:
-                    reason = "Eligible for service operations"
-                reasoning_data.append(reason)
-            
-            display_df['Detailed Reasoning'] = reasoning_data
-        
-        # Display table
-        if show_reasoning and 'Detailed Reasoning' in display_df.columns:
-            st.dataframe(
-                display_df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Trainset ID": st.column_config.TextColumn("Train ID", width="small"),
-                    "Assigned Status": st.column_config.TextColumn(
-                        "Status",
-                        width="small",
-                        help="Current assignment status"
-                    ),
-                    "Detailed Reasoning": st.column_config.TextColumn("Reasoning", width="large")
-                }
-            )
-        else:
-            # Simplified view
-            st.dataframe(
-                display_df[['Trainset ID', 'Assigned Status']],
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Trainset ID": st.column_config.TextColumn("Train ID"),
-                    "Assigned Status": st.column_config.TextColumn("Status")
-                }
-            )
-        
-        # Summary stats
-        st.markdown(f"**Showing {len(display_df)} of {len(solution_df)} trains**")
+        _detailed_view(solution_df)
     
     with tab_alerts:
-        st.markdown("### ⚠️ Operational Alerts & Notifications")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 🚨 Critical Issues")
-            
-            critical_count = 0
-            
-            # Check for certificate issues
-            if 'certificates' in data_frames:
-                expired_certs = data_frames['certificates'][
-                    pd.to_datetime(data_frames['certificates']['expiry_date']).dt.date < datetime.now().date()
-                ]
-                if not expired_certs.empty:
-                    for _, cert in expired_certs.iterrows():
-                        st.error(f"❌ {cert['trainset_id']}: {cert['certificate_type']} certificate expired")
-                        critical_count += 1
-            
-            # Check for critical job cards
-            if 'job_cards' in data_frames:
-                critical_jobs = data_frames['job_cards'][
-                    (data_frames['job_cards']['status'] == 'OPEN') & 
-                    (data_frames['job_cards']['is_critical'] == True)
-                ]
-                if not critical_jobs.empty:
-                    unique_trains = critical_jobs['trainset_id'].unique()
-                    for train in unique_trains[:5]:  # Show first 5
-                        job_count = len(critical_jobs[critical_jobs['trainset_id'] == train])
-                        st.warning(f"⚠️ {train}: {job_count} critical job(s) pending")
-                        critical_count += 1
-            
-            if critical_count == 0:
-                st.success("✅ No critical issues detected")
-        
-        with col2:
-            st.markdown("#### 📋 Maintenance Queue")
-            
-            maintenance_trains = solution_df[solution_df['Assigned Status'] == 'Maintenance']['Trainset ID'].tolist()
-            if maintenance_trains:
-                for i, train in enumerate(maintenance_trains[:5], 1):  # Show top 5
-                    if 'job_cards' in data_frames:
-                        jobs = data_frames['job_cards'][
-                            (data_frames['job_cards']['trainset_id'] == train) & 
-                            (data_frames['job_cards']['status'] == 'OPEN')
-                        ]
-                        hours = jobs['required_man_hours'].sum() if not jobs.empty else 0
-                        st.info(f"{i}. {train} - Est. {hours:.0f}h work")
-                    else:
-                        st.info(f"{i}. {train}")
-                
-                if len(maintenance_trains) > 5:
-                    st.caption(f"... and {len(maintenance_trains) - 5} more")
-            else:
-                st.success("✅ No trains in maintenance queue")
+        _tab_alerts(data_frames, status_groups, no_trains)
     
     with tab_reports:
-        st.markdown("### 📋 Reports & Export Options")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("##### Schedule Export")
-            csv = solution_df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download Schedule (CSV)",
-                data=csv,
-                file_name=f"train_schedule_{st.session_state.scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-        
-        with col2:
-            st.markdown("##### Analytics Report")
-            if st.button("📊 Generate Analytics Report", use_container_width=True):
-                st.info("Feature coming soon: Comprehensive PDF report with charts")
-        
-        with col3:
-            st.markdown("##### Email Notification")
-            if st.button("📧 Send Email Report", use_container_width=True):
-                st.info("Feature coming soon: Automated email notifications")
-        
-        st.markdown("---")
-        
-        # Summary Statistics Table
-        st.markdown("### 📈 Executive Summary")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            summary_data = {
-                "Metric": [
-                    "Total Fleet Size",
-                    "Operational Trains",
-                    "Maintenance Backlog",
-                    "Average Utilization"
-                ],
-                "Value": [
-                    f"{total_trains}",
-                    f"{in_service + standby}",
-                    f"{maintenance}",
-                    f"{((in_service + standby)/total_trains)*100:.1f}%" if total_trains > 0 else "0.0%"
-                ]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            st.dataframe(summary_df, use_container_width=True, hide_index=True)
-        
-        with col2:
-            if 'trainsets' in data_frames:
-                mileage_stats = {
-                    "Statistic": [
-                        "Min Mileage",
-                        "Max Mileage", 
-                        "Average Mileage",
-                        "Std Deviation"
-                    ],
-                    "Value (km)": [
-                        f"{data_frames['trainsets']['cumulative_mileage_km'].min():,.0f}",
-                        f"{data_frames['trainsets']['cumulative_mileage_km'].max():,.0f}",
-                        f"{data_frames['trainsets']['cumulative_mileage_km'].mean():,.0f}",
-                        f"{data_frames['trainsets']['cumulative_mileage_km'].std():,.0f}"
-                    ]
-                }
-                mileage_df = pd.DataFrame(mileage_stats)
-                st.dataframe(mileage_df, use_container_width=True, hide_index=True)
+        _tab_reports(solution_df, data_frames, kpis, mileage_stats)
 
 else:
     # Enhanced landing page
-    st.markdown("""
-    <div style="text-align: center; padding: 3rem 1rem;">
-        <h2 style="color: #6366f1; font-size: 2.2rem; margin-bottom: 1rem;">Welcome to KMRL AI Train Scheduler</h2>
-        <p style="font-size: 1.15rem; color: #64748b; margin: 2rem auto; max-width: 600px;">
-            Optimize your fleet operations with AI-powered scheduling. Select a scenario and target line, then click 'Optimize' to generate an intelligent train induction plan.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class="feature-card">
-            <div style="font-size: 3rem; margin-bottom: 1rem;">🎯</div>
-            <h4 style="color: #6366f1;">Optimized Scheduling</h4>
-            <p style="color: #64748b;">AI-driven decisions for maximum fleet efficiency</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="feature-card">
-            <div style="font-size: 3rem; margin-bottom: 1rem;">📊</div>
-            <h4 style="color: #6366f1;">Data-Driven Insights</h4>
-            <p style="color: #64748b;">Interactive charts and analytics for better planning</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown("""
-        <div class="feature-card">
-            <div style="font-size: 3rem; margin-bottom: 1rem;">⚠️</div>
-            <h4 style="color: #6366f1;">Proactive Alerts</h4>
-            <p style="color: #64748b;">Monitor critical issues like expired certs and jobs</p>
-        </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown(_LANDING_HTML, unsafe_allow_html=True)
@@ -15,6 +15,8 @@ def load_translations():
     return translations
 
 def get_translator(translations, lang):
+    # English fills any keys the selected language lacks; unknown keys fall back to the key itself
+    merged = {**translations.get("en", {}), **translations.get(lang, {})}
     def translate(key):
-        return translations.get(lang, {}).get(key, translations.get("en", {}).get(key, key))
+        return merged.get(key, key)
     return translate
\ No newline at end of file
@@ -1,8 +1,10 @@
 # solver.py
 import pandas as pd
 from ortools.sat.python import cp_model
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import os
+from solver2 import CSV_ENGINE, downcast_dtypes
 
 def load_data(scenario_path):
     """
@@ -12,17 +14,23 @@ def load_data(scenario_path):
         print(f"Error: Directory not found at '{scenario_path}'")
         return None
 
-    data = {
-        "trainsets": pd.read_csv(os.path.join(scenario_path, "trainsets_master.csv")),
-        "certificates": pd.read_csv(os.path.join(scenario_path, "fitness_certificates.csv")),
-        "job_cards": pd.read_csv(os.path.join(scenario_path, "job_cards_maximo.csv")),
-        "slas": pd.read_csv(os.path.join(scenario_path, "branding_slas.csv")),
-        "resources": pd.read_csv(os.path.join(scenario_path, "depot_resources.csv")),
-        "layout_costs": pd.read_csv(os.path.join(scenario_path, "depot_layout_costs.csv")),
+    data_files = {
+        "trainsets": ("trainsets_master.csv", {}),
+        "certificates": ("fitness_certificates.csv", {"parse_dates": ["expiry_date"]}),
+        "job_cards": ("job_cards_maximo.csv", {}),
+        "slas": ("branding_slas.csv", {}),
+        "resources": ("depot_resources.csv", {}),
+        "layout_costs": ("depot_layout_costs.csv", {}),
     }
-    
-    # Convert date column to datetime objects once after loading for efficiency
-    data["certificates"]["expiry_date"] = pd.to_datetime(data["certificates"]["expiry_date"]).dt.date
+
+    # The six files are independent, so read them concurrently
+    with ThreadPoolExecutor(max_workers=len(data_files)) as executor:
+        pending = {
+            key: executor.submit(pd.read_csv, os.path.join(scenario_path, filename), engine=CSV_ENGINE, **options)
+            for key, (filename, options) in data_files.items()
+        }
+    data = {key: future.result() for key, future in pending.items()}
+    downcast_dtypes(data)
     
     return data
 
@@ -30,29 +38,20 @@ def preprocess_data(data):
     """
     Processes raw data to create model-ready parameters, focusing on trainset eligibility.
     """
-    train_ids = data["trainsets"]["trainset_id"].tolist()
-    eligibility = {}
-    today = datetime.date.today()
+    train_ids = data["trainsets"]["trainset_id"]
+    today = pd.Timestamp(datetime.date.today())
 
-    for train_id in train_ids:
-        is_eligible = True
-        
-        certs = data["certificates"][data["certificates"]["trainset_id"] == train_id]
-        if len(certs) < 3 or (certs["expiry_date"] < today).any():
-            is_eligible = False
-        
-        if not is_eligible:
-            eligibility[train_id] = False
-            continue
+    # One grouped pass per table instead of masking both tables once per train
+    certs = data["certificates"]
+    cert_counts = certs.groupby("trainset_id").size().reindex(train_ids, fill_value=0)
+    any_expired = (certs["expiry_date"] < today).groupby(certs["trainset_id"]).any().reindex(train_ids, fill_value=False)
 
-        jobs = data["job_cards"][data["job_cards"]["trainset_id"] == train_id]
-        critical_open_jobs = jobs[(jobs["status"] == "OPEN") & (jobs["is_critical"] == True)]
-        if not critical_open_jobs.empty:
-            is_eligible = False
+    jobs = data["job_cards"]
+    critical_open_jobs = jobs[(jobs["status"] == "OPEN") & (jobs["is_critical"] == True)]
+    has_critical_job = train_ids.isin(critical_open_jobs["trainset_id"])
 
-        eligibility[train_id] = is_eligible
-        
-    return eligibility
+    is_eligible = (cert_counts.to_numpy() >= 3) & ~any_expired.to_numpy() & ~has_critical_job.to_numpy()
+    return dict(zip(train_ids.tolist(), is_eligible.tolist()))
 
 def preprocess_shunting_costs(layout_df):
     """Calculates average costs for key shunting moves."""
@@ -76,17 +75,20 @@ def create_and_solve_model(data, eligibility, shunting_costs):
     avg_mileage = data["trainsets"]["cumulative_mileage_km"].mean()
 
     # --- 1. Create Decision Variables ---
+    # Standby is whatever is left once service and maintenance are decided, so it is an expression, not a variable
     assignments = {}
     for train_id in train_ids:
+        service = model.NewBoolVar(f"{train_id}_service")
+        maintenance = model.NewBoolVar(f"{train_id}_maintenance")
         assignments[train_id] = {
-            "service": model.NewBoolVar(f"{train_id}_service"),
-            "standby": model.NewBoolVar(f"{train_id}_standby"),
-            "maintenance": model.NewBoolVar(f"{train_id}_maintenance"),
+            "service": service,
+            "standby": 1 - service - maintenance,
+            "maintenance": maintenance,
         }
 
     # --- 2. Add Fundamental Constraints ---
     for train_id in train_ids:
-        model.AddExactlyOne(assignments[train_id].values())
+        model.AddAtMostOne(assignments[train_id]["service"], assignments[train_id]["maintenance"])
 
     # --- 3. Add Hard Constraints ---
     for train_id, is_eligible in eligibility.items():
@@ -95,41 +97,37 @@ def create_and_solve_model(data, eligibility, shunting_costs):
 
     ibl_bays_capacity = data["resources"][data["resources"]["resource_id"] == "IBL_Bays"]["available_capacity"].iloc[0]
     maintenance_trains = [assignments[t]["maintenance"] for t in train_ids]
-    model.Add(sum(maintenance_trains) <= ibl_bays_capacity)
+    model.Add(cp_model.LinearExpr.Sum(maintenance_trains) <= ibl_bays_capacity)
 
     manpower_capacity = data["resources"][data["resources"]["resource_id"] == "Cleaning_Staff_ManHours"]["available_capacity"].iloc[0]
     
-    required_hours = {}
-    for train_id in train_ids:
-        open_jobs = data["job_cards"][(data["job_cards"]["trainset_id"] == train_id) & (data["job_cards"]["status"] == "OPEN")]
-        required_hours[train_id] = open_jobs["required_man_hours"].sum()
+    open_jobs = data["job_cards"][data["job_cards"]["status"] == "OPEN"]
+    required_hours = open_jobs.groupby("trainset_id")["required_man_hours"].sum().reindex(train_ids, fill_value=0).to_dict()
 
-    total_scheduled_hours = sum(assignments[t]["maintenance"] * int(required_hours.get(t, 0)) for t in train_ids)
+    total_scheduled_hours = cp_model.LinearExpr.WeightedSum(
+        maintenance_trains, [int(required_hours.get(t, 0)) for t in train_ids]
+    )
     model.Add(total_scheduled_hours <= manpower_capacity)
 
     # --- 4. Define Objective Function Components ---
-    mileage_deviations = []
-    for _, train in data["trainsets"].iterrows():
-        train_id = train["trainset_id"]
-        if train["cumulative_mileage_km"] > avg_mileage:
-            deviation = int(train["cumulative_mileage_km"] - avg_mileage)
-            mileage_deviations.append(assignments[train_id]["service"] * deviation)
-    total_mileage_cost = sum(mileage_deviations)
-
-    sla_penalties = []
-    for _, sla in data["slas"].iterrows():
-        train_id = sla["trainset_id"]
-        if train_id in assignments:
-            penalty = int(sla["penalty_per_hour"])
-            sla_penalties.append((1 - assignments[train_id]["service"]) * penalty)
-    total_branding_penalty = sum(sla_penalties)
-
-    shunting_costs_list = []
-    for train_id in train_ids:
-        shunting_costs_list.append(assignments[train_id]["maintenance"] * shunting_costs["maintenance"])
-        shunting_costs_list.append(assignments[train_id]["service"] * shunting_costs["stabling"])
-        shunting_costs_list.append(assignments[train_id]["standby"] * shunting_costs["stabling"])
-    total_shunting_cost = sum(shunting_costs_list)
+    # Each component is a single weighted sum over the assignment literals
+    over_avg = data["trainsets"][data["trainsets"]["cumulative_mileage_km"] > avg_mileage]
+    total_mileage_cost = cp_model.LinearExpr.WeightedSum(
+        [assignments[train_id]["service"] for train_id in over_avg["trainset_id"]],
+        [int(mileage - avg_mileage) for mileage in over_avg["cumulative_mileage_km"]]
+    )
+
+    # (1 - service) * penalty summed over SLAs == total penalty - weighted sum of the service literals
+    slas = data["slas"][data["slas"]["trainset_id"].isin(list(assignments))]
+    sla_penalties = [int(penalty) for penalty in slas["penalty_per_hour"]]
+    total_branding_penalty = sum(sla_penalties) - cp_model.LinearExpr.WeightedSum(
+        [assignments[train_id]["service"] for train_id in slas["trainset_id"]], sla_penalties
+    )
+
+    total_shunting_cost = cp_model.LinearExpr.WeightedSum(
+        [assignments[train_id][state] for train_id in train_ids for state in ("maintenance", "service", "standby")],
+        [shunting_costs["maintenance"], shunting_costs["stabling"], shunting_costs["stabling"]] * len(train_ids)
+    )
 
     # --- 5. Set the Final Weighted Objective ---
     w_mileage = 1
@@ -145,10 +143,15 @@ def create_and_solve_model(data, eligibility, shunting_costs):
     # --- 6. Solve the Model ---
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 30.0
+    solver.parameters.num_search_workers = 8
+    solver.parameters.log_search_progress = False
     status = solver.solve(model)
 
     # --- 7. Process and RETURN Results ---
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        # Per-train lookups built once rather than masking the frames for every train
+        mileage_by_id = data["trainsets"].drop_duplicates("trainset_id").set_index("trainset_id")["cumulative_mileage_km"].to_dict()
+        sla_by_id = data["slas"].drop_duplicates("trainset_id").set_index("trainset_id").to_dict("index")
         solution_list = []
         for train_id in train_ids:
             reason = []
@@ -160,14 +163,14 @@ def create_and_solve_model(data, eligibility, shunting_costs):
             if eligibility[train_id]: reason.append("Eligible for service")
             else: reason.append("INELIGIBLE (Cert/Job Card issue)")
 
-            train_mileage = data["trainsets"].loc[data["trainsets"]["trainset_id"] == train_id, "cumulative_mileage_km"].iloc[0]
+            train_mileage = mileage_by_id[train_id]
             mileage_percent_dev = ((train_mileage - avg_mileage) / avg_mileage) * 100
             reason.append(f"Mileage: {train_mileage:,}km ({mileage_percent_dev:+.1f}%)")
 
-            sla_info = data["slas"][data["slas"]["trainset_id"] == train_id]
-            if not sla_info.empty:
-                current = sla_info['current_exposure_hours'].iloc[0]
-                target = sla_info['target_exposure_hours'].iloc[0]
+            sla_info = sla_by_id.get(train_id)
+            if sla_info is not None:
+                current = sla_info['current_exposure_hours']
+                target = sla_info['target_exposure_hours']
                 if current < target:
                     reason.append(f"Branding SLA: ACTIVE ({current}/{target} hrs)")
 
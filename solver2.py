@@ -1,9 +1,22 @@
 import pandas as pd
+import numpy as np
 from ortools.sat.python import cp_model
-import datetime
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
 import os
 import time
 
+# Arrow's multithreaded CSV reader when pyarrow is installed, pandas' C parser otherwise
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# Per-file read options; column types are applied afterwards by downcast_dtypes so blank cells don't fail the read
+CSV_READ_OPTIONS = {
+    "certificates": {"parse_dates": ["expiry_date"]},
+}
+
+# Objective weights for the primary assignment; the app includes them in its solve cache key
+OBJECTIVE_WEIGHTS = {"mileage": 1, "branding": 10000, "shunting": 10, "urgency": 1000000}
+
 # --- Configurable Metro Lines ---
 METRO_LINES = {
     "Line A (Short: 20km)": 250,    # Approx. 20km route, multiple trips
@@ -23,41 +36,66 @@ def load_data(scenario_path):
     data_files = { "trainsets": "trainsets_master.csv", "certificates": "fitness_certificates.csv", "job_cards": "job_cards_maximo.csv", "slas": "branding_slas.csv", "resources": "depot_resources.csv", "layout_costs": "depot_layout_costs.csv" }
     data = {}
     print("--- Loading Data ---")
+    # Read all files concurrently (parsing releases the GIL); results and errors are reported in file order
+    with ThreadPoolExecutor(max_workers=len(data_files)) as executor:
+        pending = {
+            key: executor.submit(pd.read_csv, os.path.join(scenario_path, filename), engine=CSV_ENGINE, **CSV_READ_OPTIONS.get(key, {}))
+            for key, filename in data_files.items()
+        }
     for key, filename in data_files.items():
         try:
-            filepath = os.path.join(scenario_path, filename)
-            data[key] = pd.read_csv(filepath)
+            data[key] = pending[key].result()
             print(f"Loaded {len(data[key])} records from {filename}")
         except Exception as e:
             print(f"Error loading {filename}: {e}")
             return None
-    data["certificates"]["expiry_date"] = pd.to_datetime(data["certificates"]["expiry_date"]).dt.date
+    downcast_dtypes(data)
     return data
 
+def downcast_dtypes(data):
+    """
+    Shrinks the columns that every later mask and groupby touches: IDs/statuses become categories,
+    flags become bools (blank means not critical) and integer counts take the narrowest nullable integer type.
+    """
+    job_cards = data["job_cards"]
+    job_cards["trainset_id"] = job_cards["trainset_id"].astype("category")
+    job_cards["status"] = job_cards["status"].astype("category")
+    job_cards["is_critical"] = job_cards["is_critical"].fillna(False).astype(bool)
+    job_cards["required_man_hours"] = pd.to_numeric(job_cards["required_man_hours"].astype("Int64"), downcast="integer")
+    certificates = data["certificates"]
+    certificates["trainset_id"] = certificates["trainset_id"].astype("category")
+    certificates["certificate_type"] = certificates["certificate_type"].astype("category")
+    data["layout_costs"]["to_location"] = data["layout_costs"]["to_location"].astype("category")
+    data["trainsets"]["cumulative_mileage_km"] = pd.to_numeric(data["trainsets"]["cumulative_mileage_km"], downcast="integer")
+
 def preprocess_data_with_reasons(data):
     """
     Processes raw data to determine eligibility and provides specific reasons for ineligibility.
     """
-    train_ids = data["trainsets"]["trainset_id"].tolist()
-    eligibility_details = {}
-    today = datetime.date(2025, 9, 18)
+    train_ids = data["trainsets"]["trainset_id"]
+    today = pd.Timestamp(2025, 9, 18)
     print("\n--- Preprocessing Data: Checking Train Eligibility ---")
     
-    for train_id in train_ids:
-        eligibility_details[train_id] = {'is_eligible': True, 'reason': 'Eligible for service'}
-        
-        certs = data["certificates"][data["certificates"]["trainset_id"] == train_id]
-        if len(certs) < 3:
-            eligibility_details[train_id] = {'is_eligible': False, 'reason': 'Missing required certificates'}
-            continue
-        if (certs["expiry_date"] < today).any():
-            eligibility_details[train_id] = {'is_eligible': False, 'reason': 'Certificate expired'}
-            continue
-            
-        jobs = data["job_cards"][data["job_cards"]["trainset_id"] == train_id]
-        critical_open_jobs = jobs[(jobs["status"] == "OPEN") & (jobs["is_critical"] == True)]
-        if not critical_open_jobs.empty:
-            eligibility_details[train_id] = {'is_eligible': False, 'reason': 'Critical maintenance open'}
+    # One grouped pass per table; the first failing check (in this order) is the reported reason
+    certs = data["certificates"]
+    cert_counts = certs.groupby("trainset_id", observed=True).size().reindex(train_ids, fill_value=0).to_numpy()
+    any_expired = (
+        (certs["expiry_date"] < today).groupby(certs["trainset_id"], observed=True).any()
+        .reindex(train_ids, fill_value=False).to_numpy()
+    )
+    jobs = data["job_cards"]
+    critical_open_jobs = jobs[(jobs["status"] == "OPEN") & (jobs["is_critical"] == True)]
+    has_critical_job = train_ids.isin(critical_open_jobs["trainset_id"]).to_numpy()
+    
+    reasons = np.select(
+        [cert_counts < 3, any_expired, has_critical_job],
+        ['Missing required certificates', 'Certificate expired', 'Critical maintenance open'],
+        default='Eligible for service'
+    )
+    eligibility_details = {
+        train_id: {'is_eligible': reason == 'Eligible for service', 'reason': reason}
+        for train_id, reason in zip(train_ids.tolist(), reasons.tolist())
+    }
             
     print("Eligibility checks complete.")
     return eligibility_details
@@ -70,9 +108,12 @@ def preprocess_shunting_costs(layout_df):
     avg_cost_to_stabling = to_stabling_moves['shunting_cost'].mean() if not to_stabling_moves.empty else 0
     return {"maintenance": int(avg_cost_to_maintenance), "stabling": int(avg_cost_to_stabling)}
 
-def solve_primary_assignment(data, eligibility_details, shunting_costs):
+def solve_primary_assignment(data, eligibility_details, shunting_costs, max_time_in_seconds=60.0, hint=None, weights=None):
     """
     PHASE 1: Solves the core assignment problem with a penalty for not fixing critical trains.
+    An optional `hint` ({train_id: status}, e.g. the previous solution) warm-starts the search.
+    `weights` overrides OBJECTIVE_WEIGHTS. Returns (solution, required_hours, status), where status is the CP-SAT
+    status name, or "GREEDY" when the solver found nothing and the greedy fallback produced the solution.
     """
     start_time = time.time()
     model = cp_model.CpModel()
@@ -82,59 +123,131 @@ def solve_primary_assignment(data, eligibility_details, shunting_costs):
     print(f"Setting up and solving model for {len(train_ids)} trains...")
     assignments = {}
     for train_id in train_ids:
-        assignments[train_id] = {"service": model.NewBoolVar(f"{train_id}_service"), "standby": model.NewBoolVar(f"{train_id}_standby"), "maintenance": model.NewBoolVar(f"{train_id}_maintenance")}
-        model.AddExactlyOne(list(assignments[train_id].values()))
+        # Standby is implied (1 - service - maintenance), so only two literals per train are branched on
+        service, maintenance = model.NewBoolVar(f"{train_id}_service"), model.NewBoolVar(f"{train_id}_maintenance")
+        assignments[train_id] = {"service": service, "standby": 1 - service - maintenance, "maintenance": maintenance}
+        model.AddAtMostOne(service, maintenance)
         if not eligibility_details.get(train_id, {}).get('is_eligible', False):
             model.Add(assignments[train_id]["service"] == 0)
     ibl_bays_capacity = data["resources"].loc[data["resources"]["resource_id"] == "IBL_Bays", "available_capacity"].iloc[0]
-    model.Add(sum(assignments[t]["maintenance"] for t in train_ids) <= ibl_bays_capacity)
+    maintenance_literals = [assignments[t]["maintenance"] for t in train_ids]
+    model.Add(cp_model.LinearExpr.Sum(maintenance_literals) <= ibl_bays_capacity)
     manpower_capacity = data["resources"].loc[data["resources"]["resource_id"] == "Cleaning_Staff_ManHours", "available_capacity"].iloc[0]
-    required_hours = data["job_cards"][data["job_cards"]["status"] == "OPEN"].groupby("trainset_id")["required_man_hours"].sum().to_dict()
-    model.Add(sum(assignments[t]["maintenance"] * int(required_hours.get(t, 0)) for t in train_ids) <= manpower_capacity)
+    required_hours = data["job_cards"][data["job_cards"]["status"] == "OPEN"].groupby("trainset_id", observed=True)["required_man_hours"].sum().to_dict()
+    model.Add(cp_model.LinearExpr.WeightedSum(maintenance_literals, [int(required_hours.get(t, 0)) for t in train_ids]) <= manpower_capacity)
     
     critically_failed_trains = [
         train_id for train_id, details in eligibility_details.items() 
         if not details['is_eligible'] and "Critical" in details['reason']
     ]
-    urgency_penalty = sum(
-        assignments[train_id]["standby"] for train_id in critically_failed_trains
-    )
-
-    mileage_deviations = []
+    mileage_by_id = data["trainsets"].drop_duplicates("trainset_id").set_index("trainset_id")["cumulative_mileage_km"].to_dict()
+    slas = data["slas"][data["slas"]["trainset_id"].isin(list(assignments))]
+    
+    weights = {**OBJECTIVE_WEIGHTS, **(weights or {})}
+    w_mileage, w_branding, w_shunting, w_urgency = weights["mileage"], weights["branding"], weights["shunting"], weights["urgency"]
+    
+    # The whole objective is one weighted sum over the service/maintenance literals plus a constant;
+    # standby terms are expanded through standby = 1 - service - maintenance
+    objective_vars, objective_coeffs, objective_offset = [], [], 0
     for train_id in train_ids:
-        train_mileage = data["trainsets"].loc[data["trainsets"]["trainset_id"] == train_id, "cumulative_mileage_km"].iloc[0]
-        dev = int(train_mileage - avg_mileage)
-        abs_dev = model.NewIntVar(0, 200000, f'abs_dev_{train_id}')
-        model.AddAbsEquality(abs_dev, dev)
-        service_mileage_cost = model.NewIntVar(0, 200000, f'serv_mileage_cost_{train_id}')
-        model.Add(service_mileage_cost == abs_dev).OnlyEnforceIf(assignments[train_id]["service"])
-        model.Add(service_mileage_cost == 0).OnlyEnforceIf(assignments[train_id]["service"].Not())
-        mileage_deviations.append(service_mileage_cost)
-        
-    total_mileage_deviation_cost = sum(mileage_deviations)
-    total_branding_penalty = sum((1 - assignments[sla["trainset_id"]]["service"]) * int(sla["penalty_per_hour"]) for _, sla in data["slas"].iterrows() if sla["trainset_id"] in assignments)
-    total_shunting_cost = sum(assignments[t]["maintenance"] * shunting_costs["maintenance"] + (assignments[t]["service"] + assignments[t]["standby"]) * shunting_costs["stabling"] for t in train_ids)
+        # Mileage deviation (a constant per train) is paid when in service; shunting costs the maintenance
+        # rate for maintenance and the stabling rate otherwise (service + standby = 1 - maintenance)
+        abs_dev = abs(int(mileage_by_id[train_id] - avg_mileage))
+        objective_vars += [assignments[train_id]["service"], assignments[train_id]["maintenance"]]
+        objective_coeffs += [w_mileage * abs_dev, w_shunting * (shunting_costs["maintenance"] - shunting_costs["stabling"])]
+        objective_offset += w_shunting * shunting_costs["stabling"]
+    for train_id, penalty in zip(slas["trainset_id"], slas["penalty_per_hour"]):
+        # Branding penalty is paid unless the train is in service
+        objective_vars.append(assignments[train_id]["service"])
+        objective_coeffs.append(-w_branding * int(penalty))
+        objective_offset += w_branding * int(penalty)
+    for train_id in critically_failed_trains:
+        # Urgency penalty for leaving a critically failed train on standby
+        objective_vars += [assignments[train_id]["service"], assignments[train_id]["maintenance"]]
+        objective_coeffs += [-w_urgency, -w_urgency]
+        objective_offset += w_urgency
     
-    w_mileage, w_branding, w_shunting, w_urgency = 1, 10000, 10, 1000000
+    # Symmetry breaking: trains with identical coefficients everywhere in the model are interchangeable,
+    # so order each such class by state (service > maintenance > standby) instead of searching permutations
+    penalty_by_id = data["slas"].groupby("trainset_id")["penalty_per_hour"].sum().to_dict()
+    critically_failed = set(critically_failed_trains)
+    symmetry_classes = {}
+    for train_id in dict.fromkeys(train_ids):
+        signature = (
+            eligibility_details.get(train_id, {}).get('is_eligible', False),
+            train_id in critically_failed,
+            int(required_hours.get(train_id, 0)),
+            int(penalty_by_id.get(train_id, 0)),
+            abs(int(mileage_by_id[train_id] - avg_mileage)),
+        )
+        symmetry_classes.setdefault(signature, []).append(train_id)
+    for members in symmetry_classes.values():
+        for first, second in zip(members, members[1:]):
+            model.Add(
+                2 * assignments[first]["service"] + assignments[first]["maintenance"]
+                >= 2 * assignments[second]["service"] + assignments[second]["maintenance"]
+            )
     
-    model.Minimize(
-        w_mileage * total_mileage_deviation_cost + 
-        w_branding * total_branding_penalty + 
-        w_shunting * total_shunting_cost +
-        w_urgency * urgency_penalty
-    )
+    model.Minimize(cp_model.LinearExpr.WeightedSum(objective_vars, objective_coeffs) + objective_offset)
+    
+    for train_id, status in (hint or {}).items():
+        if train_id in assignments:
+            model.AddHint(assignments[train_id]["service"], status == "Revenue Service")
+            model.AddHint(assignments[train_id]["maintenance"], status == "Maintenance")
     
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 60.0
+    solver.parameters.max_time_in_seconds = max_time_in_seconds
     solver.parameters.num_search_workers = 8
     status = solver.solve(model)
     print(f"Solving completed in {time.time() - start_time:.2f} seconds.")
     if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         solution = {t: ("Revenue Service" if solver.Value(assignments[t]["service"]) else "Standby" if solver.Value(assignments[t]["standby"]) else "Maintenance") for t in train_ids}
-        return solution, required_hours
+        return solution, required_hours, solver.StatusName(status)
     else:
         print(f"Solver failed with status: {solver.StatusName(status)}")
-        return None, None
+        print("Falling back to greedy assignment.")
+        return greedy_primary_assignment(data, eligibility_details, shunting_costs, required_hours, ibl_bays_capacity, manpower_capacity, weights), required_hours, "GREEDY"
+
+def greedy_primary_assignment(data, eligibility_details, shunting_costs, required_hours, ibl_bays_capacity, manpower_capacity, weights=None):
+    """
+    Fallback for when CP-SAT finds no solution: scores trains against the same objective and assigns them in O(N log N).
+    Each train starts in whichever of service or standby costs less; trains that gain most from maintenance
+    (urgency and shunting savings over that choice) then fill the IBL bays within the man-hour budget.
+    """
+    weights = {**OBJECTIVE_WEIGHTS, **(weights or {})}
+    trains = data["trainsets"].drop_duplicates("trainset_id")
+    avg_mileage = data["trainsets"]["cumulative_mileage_km"].mean()
+    penalty_by_id = data["slas"].groupby("trainset_id", observed=True)["penalty_per_hour"].sum()
+    is_eligible = np.array([eligibility_details.get(t, {}).get('is_eligible', False) for t in trains["trainset_id"]])
+    is_critical = np.array([
+        not details.get('is_eligible', False) and "Critical" in details.get('reason', "")
+        for details in (eligibility_details.get(t, {}) for t in trains["trainset_id"])
+    ])
+    branding_penalty = trains["trainset_id"].map(penalty_by_id).fillna(0).to_numpy()
+    mileage_deviation = (trains["cumulative_mileage_km"] - avg_mileage).abs().to_numpy()
+    
+    # Objective saved by each state relative to standby
+    service_gain = np.where(is_eligible, weights["branding"] * branding_penalty - weights["mileage"] * mileage_deviation, -np.inf)
+    maintenance_gain = weights["urgency"] * is_critical - weights["shunting"] * (shunting_costs["maintenance"] - shunting_costs["stabling"])
+    trains = trains.assign(
+        status=np.where(service_gain > 0, "Revenue Service", "Standby"),
+        benefit=maintenance_gain - np.maximum(service_gain, 0),
+        hours=trains["trainset_id"].map(required_hours).fillna(0).to_numpy(),
+    )
+    
+    bays_left, hours_left = ibl_bays_capacity, manpower_capacity
+    candidates = trains[trains["benefit"] > 0].sort_values(["benefit", "hours"], ascending=[False, True], kind='stable')
+    maintenance_ids = []
+    for train_id, hours in zip(candidates["trainset_id"], candidates["hours"]):
+        if bays_left == 0:
+            break
+        if hours <= hours_left:
+            maintenance_ids.append(train_id)
+            bays_left -= 1
+            hours_left -= hours
+    solution = dict(zip(trains["trainset_id"], trains["status"]))
+    solution.update(dict.fromkeys(maintenance_ids, "Maintenance"))
+    return solution
 
 def show_train_recommendations_for_line(primary_solution, eligibility_details, required_hours, data, lines):
     """
@@ -157,35 +270,20 @@ def show_train_recommendations_for_line(primary_solution, eligibility_details, r
     except ValueError:
         print("Invalid input. Please enter a number. Exiting."); return
 
-    # 2. Prepare detailed dashboard data for all trains
-    all_trains_details = []
+    # 2. Prepare detailed dashboard data for all trains as one DataFrame
     avg_fleet_mileage = data["trainsets"]["cumulative_mileage_km"].mean()
-    today = datetime.date(2025, 9, 18)
-    
-    for train_id, status in primary_solution.items():
-        mileage = data["trainsets"].loc[data["trainsets"]["trainset_id"] == train_id, "cumulative_mileage_km"].iloc[0]
-        mileage_vs_avg = ((mileage - avg_fleet_mileage) / avg_fleet_mileage) * 100
-        
-        pending_work_hrs = required_hours.get(train_id, 0)
-        
-        future_certs = data['certificates'][(data['certificates']['trainset_id'] == train_id) & (data['certificates']['expiry_date'] >= today)]
-        next_cert_expiry = future_certs['expiry_date'].min() if not future_certs.empty else "N/A"
-
-        all_trains_details.append({
-            'id': train_id, 
-            'status': status, 
-            'mileage': mileage, 
-            'mileage_vs_avg': mileage_vs_avg,
-            'pending_work_hrs': pending_work_hrs,
-            'next_cert_expiry': next_cert_expiry,
-            'eligibility': eligibility_details[train_id]
-        })
-
-    # 3. Separate trains and apply sorting logic
-    service_trains = [t for t in all_trains_details if t['status'] == 'Revenue Service']
-    standby_trains = [t for t in all_trains_details if t['status'] == 'Standby']
-    maintenance_trains = [t for t in all_trains_details if t['status'] == 'Maintenance']
+    today = pd.Timestamp(2025, 9, 18)
+    mileage_by_id = data["trainsets"].drop_duplicates("trainset_id").set_index("trainset_id")["cumulative_mileage_km"]
+    certs = data['certificates']
+    next_expiry_by_id = certs[certs['expiry_date'] >= today].groupby('trainset_id', observed=True)['expiry_date'].min()
     
+    trains = pd.DataFrame({'id': list(primary_solution), 'status': list(primary_solution.values())})
+    trains['mileage'] = trains['id'].map(mileage_by_id)
+    trains['mileage_vs_avg'] = (trains['mileage'] - avg_fleet_mileage) / avg_fleet_mileage * 100
+    trains['pending_work_hrs'] = trains['id'].map(required_hours).fillna(0)
+    trains['next_cert_expiry'] = next_expiry_by_id.reindex(trains['id']).to_numpy()
+
+    # 3. Apply sorting logic: service trains first, then standby, then maintenance
     avg_line_mileage = sum(lines.values()) / len(lines)
     is_long_line = lines[selected_line] >= avg_line_mileage
     
@@ -193,14 +291,13 @@ def show_train_recommendations_for_line(primary_solution, eligibility_details, r
     # The branding needs calculation is now part of the reasoning, not the sort.
     if is_long_line:
         print("\n(Sorting for a LONG line: Low Mileage is better)")
-        service_trains.sort(key=lambda x: x['mileage'])
     else:
         print("\n(Sorting for a SHORT line: High Mileage is better)")
-        service_trains.sort(key=lambda x: x['mileage'], reverse=True)
-
-    standby_trains.sort(key=lambda x: x['mileage'])
-    maintenance_trains.sort(key=lambda x: x['mileage'])
-    final_ranked_list = service_trains + standby_trains + maintenance_trains
+    is_service = trains['status'] == 'Revenue Service'
+    sort_mileage = trains['mileage'].where(is_long_line | ~is_service, -trains['mileage'])
+    final_ranked = trains.assign(
+        _group=trains['status'].map({'Revenue Service': 0, 'Standby': 1, 'Maintenance': 2}), _mileage=sort_mileage
+    ).sort_values(['_group', '_mileage'], kind='stable')
     
     # 4. Display the final dashboard
     print("\n" + "="*125)
@@ -209,23 +306,24 @@ def show_train_recommendations_for_line(primary_solution, eligibility_details, r
     print(f"{'Rank':<6} {'Train ID':<10} {'Status':<18} {'Mileage vs. Avg (%)':<22} {'Next Cert Expiry':<20} {'Pending Work (hrs)':<22} {'Reasoning'}")
     print("-" * 125)
     
-    for i, train in enumerate(final_ranked_list, 1):
+    for i, train in enumerate(final_ranked.itertuples(index=False), 1):
+        eligibility = eligibility_details[train.id]
         reason = ""
-        if not train['eligibility']['is_eligible']:
-            reason = train['eligibility']['reason']
-        elif train['status'] == 'Revenue Service':
-            mileage_status = "Low Mileage" if train['mileage'] < avg_fleet_mileage else "High Mileage"
+        if not eligibility['is_eligible']:
+            reason = eligibility['reason']
+        elif train.status == 'Revenue Service':
+            mileage_status = "Low Mileage" if train.mileage < avg_fleet_mileage else "High Mileage"
             reason = f"Good for this route ({mileage_status})"
-        elif train['status'] == 'Maintenance':
-            reason = f"Scheduled work ({int(train['pending_work_hrs'])} hrs)"
-        elif train['status'] == 'Standby':
-            if train['mileage'] > avg_fleet_mileage:
+        elif train.status == 'Maintenance':
+            reason = f"Scheduled work ({int(train.pending_work_hrs)} hrs)"
+        elif train.status == 'Standby':
+            if train.mileage > avg_fleet_mileage:
                 reason = "Eligible, but high mileage (held for balancing)"
             else:
                 reason = "Eligible, held as operational spare"
 
-        expiry_str = str(train['next_cert_expiry']) if train['next_cert_expiry'] != "N/A" else "N/A"
-        print(f"#{i:<5} {train['id']:<10} {train['status']:<18} {train['mileage_vs_avg']:<+22.1f} {expiry_str:<20} {int(train['pending_work_hrs']):<22} {reason}")
+        expiry_str = train.next_cert_expiry.strftime("%Y-%m-%d") if pd.notna(train.next_cert_expiry) else "N/A"
+        print(f"#{i:<5} {train.id:<10} {train.status:<18} {train.mileage_vs_avg:<+22.1f} {expiry_str:<20} {int(train.pending_work_hrs):<22} {reason}")
     print("-" * 125)
 
 if __name__ == "__main__":
@@ -236,7 +334,7 @@ if __name__ == "__main__":
         eligibility_details = preprocess_data_with_reasons(data_frames)
         shunting_costs_dict = preprocess_shunting_costs(data_frames["layout_costs"])
         
-        primary_solution, required_hours = solve_primary_assignment(data_frames, eligibility_details, shunting_costs_dict)
+        primary_solution, required_hours, _ = solve_primary_assignment(data_frames, eligibility_details, shunting_costs_dict)
         
         if primary_solution:
             print(f"\nPhase 1 Complete. Identified {len([s for s in primary_solution.values() if s == 'Revenue Service'])} trains fit for service.")